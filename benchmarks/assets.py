@@ -0,0 +1,36 @@
+"""
+Memory use and blit cost of the Golden Pony assets, as loaded by the asset
+manager (display format) and as raw pygame.image.load surfaces.
+
+Run from the repository root:  python benchmarks/assets.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+
+def raw_blit_cost(path, target, repeats):
+    surface = pygame.image.load(path)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        target.blit(surface, (0, 0))
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def run(repeats=200):
+    target = main.init_display()
+    main.pony_assets.load()
+    main.assets.measure_blit_costs(target, repeats)
+    print(f"{'asset':<28}{'size':>10}{'KiB':>8}{'alpha':>7}{'raw (us)':>10}{'conv (us)':>11}")
+    for row in main.assets.report():
+        size = "x".join(str(n) for n in row["size"])
+        raw = raw_blit_cost(row["path"], target, repeats)
+        print(f"{row['path']:<28}{size:>10}{row['bytes'] / 1024:>8.0f}{str(row['alpha']):>7}"
+              f"{raw:>10.1f}{row['blit_us']:>11.1f}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,49 @@
+"""
+Bulk number generation throughput and frame cost. A BulkDraw of the given
+size is run the way BulkScene runs it, BULK_FRAME_BUDGET seconds of chunks
+per frame, with each backend that is installed (NumPy and the pure-Python
+fallback). Reports values per second, the number of frames the draw was
+spread over and the longest frame, which bounds how unresponsive the watch
+gets while drawing.
+
+Run from the repository root:  python benchmarks/bulk.py [count] [max_number]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+def measure(count, max_number, path):
+    draw = main.BulkDraw(max_number, count, path)
+    frames = []
+    started = time.perf_counter()
+    while not draw.done():
+        frame_started = time.perf_counter()
+        draw.run_for(main.BULK_FRAME_BUDGET)
+        frames.append(time.perf_counter() - frame_started)
+    elapsed = time.perf_counter() - started
+    mean, sd, low, high = draw.stats()
+    return draw.backend, count / elapsed, len(frames), max(frames), mean, sd
+
+def run(count=1_000_000, max_number=100):
+    main.init_display()
+    main.numgen_assets.load()
+    backends = [main.numpy, None] if main.numpy is not None else [None]
+    if main.numpy is None:
+        print("NumPy is not installed; only the pure-Python fallback is measured")
+    path = os.path.join(tempfile.mkdtemp(prefix="xi-bench-"), "numbers.txt")
+    print(f"{count:,} values from 1-{max_number}")
+    print(f"{'backend':<9}{'values/s':>13}{'frames':>8}{'max frame ms':>14}{'mean':>8}{'sd':>8}")
+    for backend in backends:
+        main.numpy = backend
+        name, rate, frames, longest, mean, sd = measure(count, max_number, path)
+        print(f"{name:<9}{rate:>13,.0f}{frames:>8}{longest * 1000:>14.2f}{mean:>8.2f}{sd:>8.2f}")
+    os.remove(path)
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,89 @@
+"""
+Drag latency on the Number Generator slider and the app menu with motion
+coalescing off and on. The drag grabs the knob (or the list) and every frame
+queues a burst of MOUSEMOTION events, STEP_PX apart, as a touchscreen does
+during a fast drag; the pointer position pygame reports follows the burst.
+The latency is the time from queuing a burst to the display push of the frame
+that shows it. Frames are not rate limited, so this is the processing part of
+the latency. The drag turns only on frame boundaries, so every frame moves the
+knob or the list and must push; a run where any frame did not is an error.
+
+Run from the repository root:  python benchmarks/drag.py [events_per_frame]
+"""
+import statistics
+import sys
+
+from harness import BenchmarkDone, FrameRecorder, drive_scenes_headless, mouse
+
+import pygame
+import main
+
+FRAMES = 300
+STEP_PX = 3  # distance between motion events; above the jitter deadband
+
+def back_and_forth(start, direction, travel, events_per_frame):
+    """
+    Returns the coordinate of motion event i of a drag that goes travel px
+    from start and back, turning only between frames.
+    """
+    leg = max(1, travel // (STEP_PX * events_per_frame)) * events_per_frame
+    def coordinate(i):
+        k = i % (2 * leg)
+        return start + direction * STEP_PX * (k if k <= leg else 2 * leg - k)
+    return coordinate
+
+def slider_drag(events_per_frame):
+    x = back_and_forth(main.slider_x, 1, main.slider_width, events_per_frame)
+    return (main.slider_x, main.slider_y), lambda i: (x(i), main.slider_y)
+
+def menu_drag(events_per_frame):
+    # Starts low in the list and drags up first, so the list scrolls from the top
+    area = main.AppMenuScene.scroll_area
+    y = back_and_forth(area.bottom - 20, -1, min(area.height - 40, -main.AppMenuScene().min_scroll),
+                       events_per_frame)
+    return (area.centerx, y(0)), lambda i: (area.centerx, y(i))
+
+CASES = [
+    ("slider", main.SliderScene, slider_drag),
+    ("app_menu", main.AppMenuScene, menu_drag),
+]
+
+def measure(make_scene, drag, events_per_frame, coalesce):
+    main.touch_input.coalesce = coalesce
+    grab, path = drag(events_per_frame)
+    step = [0]
+    def script(frame):
+        if frame == 0:
+            mouse.pos = grab
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=grab, button=1))
+        for _ in range(events_per_frame):
+            step[0] += 1
+            mouse.move(path(step[0]), buttons=(1, 0, 0))
+    recorder = main.display = FrameRecorder(FRAMES, script, track_allocations=False)
+    pygame.event.clear()
+    mouse.pos = grab
+    mouse.pressed = True
+    try:
+        main.scene_manager.run(make_scene())
+    except BenchmarkDone:
+        pass
+    if recorder.pushes != recorder.frames:
+        raise RuntimeError(f"only {recorder.pushes} of {recorder.frames} frames were pushed; "
+                           "the drag did not move anything")
+    latencies = [t * 1000 for t in recorder.times]
+    return statistics.mean(latencies), sorted(latencies)[int(0.99 * len(latencies))]
+
+def run(events_per_frame=20):
+    main.init_display()
+    drive_scenes_headless()
+    main.numgen_assets.load()
+    main.menu_assets.load()
+    print(f"{events_per_frame} motion events per frame")
+    print(f"{'scene':<10}{'coalescing':<12}{'mean ms':>9}{'p99 ms':>9}")
+    for name, make_scene, drag in CASES:
+        for coalesce in (False, True):
+            mean, p99 = measure(make_scene, drag, events_per_frame, coalesce)
+            print(f"{name:<10}{'on' if coalesce else 'off':<12}{mean:>9.3f}{p99:>9.3f}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,57 @@
+"""
+Throughput of the secure entropy pool against the default Mersenne Twister
+and random.SystemRandom, which makes one os.urandom call per draw, for the
+draws the number apps make. Also reports how many os.urandom calls the pool
+made, and checks that its randint is unbiased on a range that is not a power
+of two.
+
+Run from the repository root:  python benchmarks/entropy.py [draws]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+# (label, draw) pairs; each draw takes a generator and makes one draw
+DRAWS = (
+    ("randint(1, 100)", lambda rng: rng.randint(1, 100)),
+    ("randrange(10**12)", lambda rng: rng.randrange(10**12)),
+    ("random()", lambda rng: rng.random()),
+)
+
+def rate(draw, rng, draws):
+    started = time.perf_counter()
+    for _ in range(draws):
+        draw(rng)
+    return draws / (time.perf_counter() - started)
+
+def check_bias(draws=600_000, sides=6):
+    pool = main.EntropyPool()
+    counts = [0] * sides
+    for _ in range(draws):
+        counts[pool.randint(1, sides) - 1] += 1
+    expected = draws / sides
+    chi_square = sum((c - expected) ** 2 / expected for c in counts)
+    # 20.5 is the 0.999 quantile of chi-square with 5 degrees of freedom
+    print(f"randint(1, {sides}) over {draws:,} draws: chi-square {chi_square:.2f} (limit 20.5)")
+    if chi_square > 20.5:
+        raise AssertionError(f"secure randint looks biased: {counts}")
+
+def run(draws=200_000):
+    check_bias()
+    generators = (("mersenne", random.Random()), ("system", random.SystemRandom()),
+                  ("pool", main.EntropyPool()))
+    print(f"{'draw':<19}" + "".join(f"{name + ' /s':>15}" for name, _ in generators) + f"{'urandom calls':>15}")
+    for label, draw in DRAWS:
+        pool = generators[2][1]
+        refills = pool.refills
+        rates = [rate(draw, rng, draws) for _, rng in generators]
+        print(f"{label:<19}" + "".join(f"{r:>15,.0f}" for r in rates) + f"{pool.refills - refills:>15,}")
+
+if __name__ == "__main__":
+    run(int(float(sys.argv[1])) if len(sys.argv) > 1 else 200_000)
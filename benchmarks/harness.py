@@ -0,0 +1,116 @@
+"""
+Pieces shared by the benchmarks that drive scenes through the real scene
+manager: an uncapped clock, a one-tick-per-frame game timestep, scripted
+pointer input and a display layer that times each frame and feeds the next
+frame's input.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+
+class BenchmarkDone(Exception):
+    pass
+
+class UncappedClock:
+    """Stands in for the scene manager's clock so frames run as fast as they can."""
+    def tick(self, framerate=0):
+        return 0
+
+class SteppedTimestep(main.FixedTimestep):
+    """
+    Stands in for the game's wall-clock timestep: one simulation tick per frame,
+    drawn halfway to the next, so uncapped frames still play the game.
+    """
+    def advance(self):
+        self.frames += 1
+        self.ticks += 1
+        return 1
+
+    def alpha(self):
+        return 0.5
+
+class ScriptedInput:
+    """Mouse state the screens read through pygame.mouse, set by the scripts."""
+    def __init__(self):
+        self.pos = (0, 0)
+        self.pressed = False
+
+    def get_pos(self):
+        return self.pos
+
+    def get_pressed(self, num_buttons=3):
+        return (self.pressed, False, False)
+
+    def click(self, pos):
+        self.pos = pos
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1))
+
+    def move(self, pos, buttons=(0, 0, 0)):
+        rel = (pos[0] - self.pos[0], pos[1] - self.pos[1])
+        self.pos = pos
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=buttons))
+
+    def key(self, key):
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+mouse = ScriptedInput()
+
+def drive_scenes_headless():
+    """
+    Points pygame.mouse at the scripted input and lets the scene manager run
+    uncapped, drawing every frame, with touch input in screen coordinates.
+    """
+    pygame.mouse.get_pos = mouse.get_pos
+    pygame.mouse.get_pressed = mouse.get_pressed
+    main.clock = UncappedClock()
+    main.scene_manager.idle = False  # draw every frame, even when nothing changes
+    main.touch_input.set_calibration(main.calibration_from_flags(False, False, False))
+
+def repaint_top_scene():
+    """Drops the top scene's render state, so its next frame is a full repaint."""
+    main.scene_manager.top().last_state = None
+
+class FrameRecorder(main.DirtyDisplay):
+    """
+    Display layer that timestamps every present(), feeds the screen its next
+    scripted input and stops the screen after the requested number of frames.
+    repaint, if given, runs after every frame's script, so a screen that
+    would otherwise sit idle can be made to draw again.
+    """
+    def __init__(self, frames, script, track_allocations, repaint=None):
+        main.DirtyDisplay.__init__(self, (main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+        self.target_frames = frames
+        self.script = script
+        self.track_allocations = track_allocations
+        self.repaint = repaint
+        self.times = []
+        self.allocated = []
+        self.last = None
+
+    def present(self):
+        pixels = main.DirtyDisplay.present(self)
+        now = time.perf_counter()
+        if self.last is not None:
+            self.times.append(now - self.last)
+        if self.track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.last is not None:
+                self.allocated.append(peak - self.frame_start_memory)
+            tracemalloc.reset_peak()
+            self.frame_start_memory = tracemalloc.get_traced_memory()[0]
+        if len(self.times) >= self.target_frames or len(self.allocated) >= self.target_frames:
+            raise BenchmarkDone()
+        # DirtyDisplay.present() has already counted this frame; scripts count from 0
+        self.script(self.frames - 1)
+        if self.repaint:
+            self.repaint()
+        self.last = time.perf_counter()
+        return pixels
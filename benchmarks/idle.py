@@ -0,0 +1,59 @@
+"""
+CPU time and wakeups per second of an idle watch, with the scene manager
+redrawing at each scene's fps (polling) and with idle mode sleeping until the
+next visual change or input.
+
+Each scene runs untouched for a few seconds of real time; a wakeup is either
+a frame or one idle check of the event queue.
+
+Run from the repository root:  python benchmarks/idle.py [seconds]
+"""
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+
+def running_stopwatch():
+    engine = main.TimerEngine()
+    engine.select("Stopwatch")
+    engine.start()
+    return main.TimerScene(engine)
+
+SCENES = [
+    ("home", main.HomeScene),
+    ("app_menu", main.AppMenuScene),
+    ("stopwatch", running_stopwatch),
+    ("pony_menu", main.PonyMenuScene),
+]
+
+def measure(make_scene, idle, seconds):
+    main.scene_manager.idle = idle
+    main.scene_manager.idle_wakeups = 0
+    main.display.frames = 0
+    pygame.event.clear()
+    timer = threading.Timer(seconds, lambda: pygame.event.post(pygame.event.Event(pygame.QUIT)))
+    cpu = time.process_time()
+    timer.start()
+    main.scene_manager.run(make_scene())
+    cpu = time.process_time() - cpu
+    frames = main.display.frames
+    return cpu / seconds * 1000, frames / seconds, (frames + main.scene_manager.idle_wakeups) / seconds
+
+def run(seconds=5.0):
+    main.init_display()
+    for bundle in (main.home_assets, main.menu_assets, main.timer_assets, main.pony_assets):
+        bundle.load()
+    print(f"{'scene':<11}{'mode':<9}{'CPU ms/s':>10}{'frames/s':>10}{'wakeups/s':>11}")
+    for name, make_scene in SCENES:
+        for idle in (False, True):
+            cpu, frames, wakeups = measure(make_scene, idle, seconds)
+            print(f"{name:<11}{'idle' if idle else 'polling':<9}{cpu:>10.2f}{frames:>10.1f}{wakeups:>11.1f}")
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
@@ -0,0 +1,54 @@
+"""
+App menu frame cost against catalog size. The menu is filled with 4, 40, 400
+and 4000 entries and dragged at a steady DRAG_SPEED, bouncing off the ends of
+the list, redrawing every frame. The per-frame cost should stay flat because
+only the rows inside the viewport are drawn and each row surface is rendered
+once per highlight state. Also reports how many row surfaces were rendered.
+
+Run from the repository root:  python benchmarks/menu.py [frames]
+"""
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+
+SIZES = (4, 40, 400, 4000)
+DRAG_SPEED = 6  # pixels per frame
+
+def catalog(size):
+    names = list(main.menu_items)
+    return (names * (size // len(names) + 1))[:size]
+
+def measure(size, frames):
+    scene = main.AppMenuScene(catalog(size))
+    scene.enter()
+    span = -scene.min_scroll
+    times = []
+    for frame in range(frames):
+        started = time.perf_counter()
+        travel = frame * DRAG_SPEED % (2 * span) if span else 0
+        scene.scroll_to(-min(travel, 2 * span - travel))
+        scene.update(0)
+        scene.render(main.screen)
+        main.display.present()
+        times.append(time.perf_counter() - started)
+    times_ms = [t * 1000 for t in times[1:]]
+    return statistics.mean(times_ms), sorted(times_ms)[int(0.99 * len(times_ms))], scene.list.rendered
+
+def run(frames=600):
+    main.init_display()
+    main.menu_assets.load()
+    pygame.mouse.get_pos = lambda: (0, 0)
+    print(f"{'entries':>8}{'mean ms':>9}{'p99 ms':>9}{'rows rendered':>15}")
+    for size in SIZES:
+        mean, p99, rendered = measure(size, frames)
+        print(f"{size:>8}{mean:>9.3f}{p99:>9.3f}{rendered:>15}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
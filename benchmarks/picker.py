@@ -0,0 +1,62 @@
+"""
+Weighted picker cost against list size: building the alias tables, one pick,
+one weight change (an incremental rebuild of one block and the table over
+blocks) and one pick without replacement, against random.choices with the
+same weights and a full rebuild for reference. First checks that pick
+frequencies match the weights on a small list.
+
+Run from the repository root:  python benchmarks/picker.py
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+SIZES = (18, 1_000, 10_000, 50_000)
+REPEATS = 2_000
+
+def per_call(fn, repeats=REPEATS):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) / repeats
+
+def check_frequencies(picks=400_000):
+    weights = [0, 1, 2, 3, 4, 0, 10]
+    picker = main.WeightedPicker([str(i) for i in range(len(weights))], weights,
+                                 rng=random.Random(7), block_size=3)
+    counts = [0] * len(weights)
+    for _ in range(picks):
+        counts[picker.pick()] += 1
+    worst = max(abs(c / picks - w / sum(weights)) for c, w in zip(counts, weights))
+    print(f"largest pick frequency error over {picks:,} picks: {worst:.4f}")
+    if worst > 0.005:
+        raise AssertionError(f"pick frequencies {counts} do not follow weights {weights}")
+
+def run():
+    check_frequencies()
+    rng = random.Random(1)
+    print(f"{'entries':>8}{'build ms':>10}{'pick us':>9}{'edit us':>9}{'unique us':>11}"
+          f"{'choices us':>12}{'rebuild ms':>12}")
+    for size in SIZES:
+        names = [f"name {i}" for i in range(size)]
+        weights = [rng.randint(1, 5) for _ in range(size)]
+        started = time.perf_counter()
+        picker = main.WeightedPicker(names, weights, rng=rng)
+        build = time.perf_counter() - started
+        pick = per_call(picker.pick)
+        edit = per_call(lambda: picker.set_weight(rng.randrange(size), rng.randint(0, 5)))
+        rebuild = per_call(picker.rebuild, 20)
+        picker = main.WeightedPicker(names, weights, rng=rng)
+        unique = per_call(picker.pick_unique, min(REPEATS, size))
+        choices = per_call(lambda: rng.choices(names, weights), 200)
+        print(f"{size:>8,}{build * 1000:>10.2f}{pick * 1e6:>9.2f}{edit * 1e6:>9.1f}{unique * 1e6:>11.1f}"
+              f"{choices * 1e6:>12.1f}{rebuild * 1000:>12.2f}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+"""
+Per-call cost of the rounded rect helpers before (rect + circle primitives) and
+after (cached shape surfaces), for the shapes the watch draws every frame. Each
+case also compares the pixels both paths paint.
+
+Run from the repository root:  python benchmarks/rounded_rect.py
+"""
+import os
+import sys
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main
+
+main.init_display()
+
+FILL_CASES = [
+    ("background panel", pygame.Rect(10, 10, 460, 300), main.LIGHT_GRAY, 15),
+    ("menu row", pygame.Rect(20, 30, 440, 65), main.RED, 10),
+    ("numgen button", pygame.Rect(165, 220, 150, 40), main.GOLD, 10),
+]
+
+OUTLINE_CASES = [
+    ("home border", pygame.Rect(0, 0, main.SCREEN_WIDTH, main.SCREEN_HEIGHT), main.BASE, 15, 4),
+    ("thin outline", pygame.Rect(40, 40, 200, 80), main.GOLD, 10, 2),
+]
+
+def same_pixels(before, after):
+    """Returns True if both draw callables paint exactly the same pixels."""
+    expected = pygame.Surface((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    actual = pygame.Surface((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    expected.fill(main.LIGHT_GRAY)
+    actual.fill(main.LIGHT_GRAY)
+    before(expected)
+    after(actual)
+    return pygame.image.tostring(expected, "RGB") == pygame.image.tostring(actual, "RGB")
+
+def report(name, before, after, number):
+    target = main.screen
+    after(target)  # warm the cache
+    before_time = timeit.timeit(lambda: before(target), number=number)
+    after_time = timeit.timeit(lambda: after(target), number=number)
+    pixels = "match" if same_pixels(before, after) else "DIFFER"
+    print(f"{name:<18}{before_time / number * 1e6:>14.1f}{after_time / number * 1e6:>14.1f}"
+          f"{before_time / after_time:>9.1f}x  {pixels}")
+    return pixels == "match"
+
+def run(number=2000):
+    print(f"{'shape':<18}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}  pixels")
+    ok = True
+    for name, rect, color, radius in FILL_CASES:
+        ok &= report(name,
+                     lambda s: main._draw_rounded_rect_primitives(s, rect, color, radius),
+                     lambda s: main.draw_rounded_rect(s, rect, color, radius),
+                     number)
+    for name, rect, color, radius, width in OUTLINE_CASES:
+        ok &= report(name,
+                     lambda s: main._draw_rounded_rect_outline_primitives(s, rect, color, radius, width),
+                     lambda s: main.draw_rounded_rect_outline(s, rect, color, radius, width),
+                     number)
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
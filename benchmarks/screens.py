@@ -0,0 +1,284 @@
+"""
+Frame-time benchmark for every watch screen, run headless on the SDL dummy
+video driver with scripted input and no frame limiter. Golden Pony runs one
+simulation tick per frame, since its wall-clock timestep would hand out none
+at uncapped frame rates.
+
+Each screen is driven for a number of frames (a frame ends when the screen
+pushes to the display) and reports mean/p50/p99 frame time plus the bytes
+allocated per frame, measured in a second pass under tracemalloc so the timing
+pass is not slowed down. Screens that would sit still under their script are
+made to repaint every frame, and a run in which any frame pushed nothing is an
+error, so the numbers are never those of skipped frames. Golden Pony also fails
+if its fence pool had to allocate past the preallocated fences.
+
+    python benchmarks/screens.py                 # run and compare to the baseline
+    python benchmarks/screens.py --save          # run and write a new baseline
+    python benchmarks/screens.py home golden_pony --frames 600
+
+The baseline is machine specific, so record it on the device being compared.
+The run exits with status 1 if any screen's mean frame time regresses past the
+threshold.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+
+from harness import (BenchmarkDone, FrameRecorder, SteppedTimestep, drive_scenes_headless, mouse,
+                     repaint_top_scene)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+import pygame
+import main
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "screens_baseline.json")
+
+# ----------------------
+# Scripted screens
+# ----------------------
+# Each entry is (start, script, check, repaint): start() runs the screen's
+# scenes until the recorder stops it; script(frame) queues the input for the
+# given frame; check() returns None if the run reached the state the script
+# aims for, or else what went wrong, so a broken script cannot time an idle
+# screen. repaint, if not None, runs after every frame; screens whose scripted
+# input does not change what they show every frame use it to force a repaint,
+# so every timed frame draws something rather than skipping.
+
+def run_home():
+    main.main()
+
+def script_home(frame):
+    # Hover on and off the ENTER button now and then
+    if frame % 60 == 0:
+        mouse.pos = main.button_rect.center if frame % 120 == 0 else (10, 10)
+
+def check_home():
+    if not isinstance(main.scene_manager.top(), main.HomeScene):
+        return "left the home screen"
+
+def run_app_menu():
+    main.scene_manager.run(main.AppMenuScene())
+
+def script_app_menu(frame):
+    if frame % 10 == 0:
+        mouse.key(pygame.K_DOWN)
+
+def check_app_menu():
+    # The selection wraps, so look for a highlighted row of every entry instead
+    scene = main.scene_manager.top()
+    if not all((i, True) in scene.list.rows for i in range(len(scene.items))):
+        return "the selection did not reach every entry"
+
+def run_slider():
+    main.scene_manager.run(main.SliderScene())
+
+def script_slider(frame):
+    # Grab the knob, then drag it back and forth along the track
+    if frame == 0:
+        mouse.click((main.slider_x, main.slider_y))
+        pygame.event.clear(pygame.MOUSEBUTTONUP)
+    # Turning in whole steps keeps every move above the touch jitter deadband
+    steps = main.slider_width // 7
+    k = (frame + 1) % (2 * steps)
+    x = main.slider_x + 7 * min(k, 2 * steps - k)
+    mouse.move((x, main.slider_y), buttons=(1, 0, 0))
+
+def check_slider():
+    scene = main.scene_manager.top()
+    if not isinstance(scene, main.SliderScene) or scene.knob_x == main.slider_x:
+        return "the knob was never dragged"
+
+def run_num_gen():
+    main.scene_manager.run(main.SliderScene())
+
+def script_num_gen(frame):
+    if frame == 0:
+        mouse.click((main.SCREEN_WIDTH // 2, 240))  # Generate
+    elif frame % 60 == 0:
+        mouse.pos = (main.SCREEN_WIDTH // 2, 20) if frame % 120 == 0 else (10, 300)
+
+def check_num_gen():
+    if not isinstance(main.scene_manager.top(), main.NumberScene):
+        return "Generate did not open the number screen"
+
+def run_timer():
+    main.scene_manager.run(main.TimerScene())
+
+def script_timer(frame):
+    if frame == 0:
+        mouse.click((main.SCREEN_WIDTH // 2, main.SCREEN_HEIGHT // 2 + 35))  # Stopwatch
+    elif frame == 1:
+        mouse.click((100, 280))  # Start
+        mouse.pos = (10, 10)
+
+def check_timer():
+    scene = main.scene_manager.top()
+    if not isinstance(scene, main.TimerScene) or scene.engine.mode != "Stopwatch" or not scene.engine.running:
+        return "the stopwatch was not started"
+
+def run_pony_menu():
+    main.scene_manager.run(main.PonyMenuScene())
+
+def script_pony_menu(frame):
+    pass
+
+def check_pony_menu():
+    if not isinstance(main.scene_manager.top(), main.PonyMenuScene):
+        return "left the pony menu"
+
+# Every sim a Golden Pony run starts, so the check can read their fence pools
+pony_sims = []
+
+def run_golden_pony():
+    pony_sims.clear()
+    main.scene_manager.run(main.PonyMenuScene(), main.PonyGameScene())
+
+def script_golden_pony(frame):
+    # Flap for one frame in every twelve; after a crash this restarts from the pony menu
+    mouse.pressed = frame % 12 == 0
+    if mouse.pressed:
+        mouse.click((main.SCREEN_WIDTH // 2, 200))
+
+def repaint_golden_pony():
+    # A crashed run stands still until the restart, so repaint it in full
+    scene = main.scene_manager.top()
+    if isinstance(scene, main.PonyGameScene) and scene.sim.game_over:
+        scene.renderer.first_frame = True
+    else:
+        repaint_top_scene()
+
+def check_golden_pony():
+    if main.pony_timestep.ticks == 0:
+        return "the game never stepped"
+    allocations = sum(sim.fence_pool.allocations for sim in pony_sims)
+    if allocations:
+        return f"the fence pool allocated {allocations} fences past its preallocated ones"
+
+SCREENS = {
+    "home": (run_home, script_home, check_home, repaint_top_scene),
+    "app_menu": (run_app_menu, script_app_menu, check_app_menu, repaint_top_scene),
+    "slider": (run_slider, script_slider, check_slider, None),
+    "num_gen": (run_num_gen, script_num_gen, check_num_gen, repaint_top_scene),
+    "timer": (run_timer, script_timer, check_timer, repaint_top_scene),
+    "pony_menu": (run_pony_menu, script_pony_menu, check_pony_menu, repaint_top_scene),
+    "golden_pony": (run_golden_pony, script_golden_pony, check_golden_pony, repaint_golden_pony),
+}
+
+def setup():
+    drive_scenes_headless()
+    main.pony_timestep = SteppedTimestep(main.SIM_HZ)
+    main.init_display()
+    # Keep benchmark high scores out of the watch's real state store
+    state_dir = tempfile.mkdtemp(prefix="xi-bench-")
+    main.open_state_store(os.path.join(state_dir, "state.journal"))
+    main.init_display = lambda: main.screen
+    main.open_state_store = lambda *args: main.state_store
+    for bundle in (main.home_assets, main.menu_assets, main.numgen_assets,
+                   main.timer_assets, main.pony_assets):
+        bundle.load()
+    # Same fences on every run
+    new_pony_sim = main.new_pony_sim
+    def seeded_pony_sim():
+        sim = new_pony_sim()
+        sim.reset(1234)
+        pony_sims.append(sim)
+        return sim
+    main.new_pony_sim = seeded_pony_sim
+
+def drive(name, frames, track_allocations):
+    start, script, check, repaint = SCREENS[name]
+    pygame.event.clear()
+    mouse.pos = (0, 0)
+    mouse.pressed = False
+    recorder = FrameRecorder(frames, script, track_allocations, repaint)
+    main.display = recorder
+    if track_allocations:
+        tracemalloc.start()
+    try:
+        start()
+    except BenchmarkDone:
+        pass
+    finally:
+        if track_allocations:
+            tracemalloc.stop()
+    problem = check()
+    if not problem and recorder.pushes < recorder.frames:
+        problem = f"only {recorder.pushes} of {recorder.frames} frames pushed anything"
+    if problem:
+        raise RuntimeError(f"{name}: the scripted run went wrong: {problem}")
+    return recorder
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def measure(name, frames):
+    timing = drive(name, frames, track_allocations=False)
+    allocations = drive(name, frames, track_allocations=True)
+    times_ms = [t * 1000 for t in timing.times]
+    return {
+        "frames": len(times_ms),
+        "mean_ms": statistics.mean(times_ms),
+        "p50_ms": percentile(times_ms, 0.50),
+        "p99_ms": percentile(times_ms, 0.99),
+        "alloc_bytes_per_frame": statistics.mean(allocations.allocated),
+        "pixels_per_frame": timing.pixels_per_frame(),
+    }
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("screens", nargs="*", help="screens to run (default: all): " + ", ".join(SCREENS))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed mean frame time increase over the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.screens if name not in SCREENS]
+    if unknown:
+        parser.error("unknown screen(s): " + ", ".join(unknown))
+
+    setup()
+    names = args.screens or list(SCREENS)
+    results = {}
+    print(f"{'screen':<13}{'mean ms':>9}{'p50 ms':>9}{'p99 ms':>9}{'alloc B/frame':>15}{'px/frame':>10}")
+    for name in names:
+        results[name] = result = measure(name, args.frames)
+        print(f"{name:<13}{result['mean_ms']:>9.3f}{result['p50_ms']:>9.3f}{result['p99_ms']:>9.3f}"
+              f"{result['alloc_bytes_per_frame']:>15.0f}{result['pixels_per_frame']:>10.0f}")
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("no baseline yet; run with --save to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressed = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        limit = baseline[name]["mean_ms"] * (1 + args.threshold)
+        if result["mean_ms"] > limit:
+            regressed.append(name)
+            print(f"REGRESSION {name}: mean {result['mean_ms']:.3f} ms > {limit:.3f} ms "
+                  f"(baseline {baseline[name]['mean_ms']:.3f} ms + {args.threshold:.0%})")
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,55 @@
+"""
+Time from process start to the first home clock frame being pushed, averaged
+over several fresh processes. The part spent after pygame itself is imported is
+reported separately, since importing pygame is outside main.py's control.
+
+Run from the repository root:  python benchmarks/startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs main() until its first frame: a QUIT event is queued as soon as the
+# display is open, and main() still renders and pushes that frame before exiting.
+CHILD = """
+import time
+started = time.perf_counter()
+import pygame
+pygame_ready = time.perf_counter()
+import main
+open_display = main.init_display
+def init_display():
+    surface = open_display()
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    return surface
+main.init_display = init_display
+try:
+    main.main()
+except SystemExit:
+    pass
+first_frame = main.startup_started + main.time_to_first_frame
+print("first_frame_ms", (first_frame - started) * 1000, (first_frame - pygame_ready) * 1000)
+"""
+
+def measure_once():
+    env = dict(os.environ, SDL_VIDEODRIVER=os.environ.get("SDL_VIDEODRIVER", "dummy"))
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    for line in out.splitlines():
+        if line.startswith("first_frame_ms"):
+            return tuple(float(value) for value in line.split()[1:])
+    raise RuntimeError("main() did not report its first frame:\n" + out)
+
+def run(runs=5):
+    samples = [measure_once() for _ in range(runs)]
+    total = [sample[0] for sample in samples]
+    after_import = [sample[1] for sample in samples]
+    print(f"time to first clock frame over {runs} runs: mean {statistics.mean(total):.1f} ms "
+          f"(min {min(total):.1f} ms); after importing pygame: mean {statistics.mean(after_import):.1f} ms "
+          f"(min {min(after_import):.1f} ms)")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,92 @@
+"""
+Accelerated-clock check of the timer engine: hours of stopwatch and countdown
+run in well under a second against a fake nanosecond clock. The renderer is
+woken at next_change() plus a random scheduling delay, as the idle loop would
+be, and every wake must land on the expected readout. Drift is how far the
+readout's second boundaries have moved from the true ones once the injected
+delay is taken out. It must stay below a millisecond; with integer
+nanoseconds it should be exactly zero.
+
+For comparison, the same wakeups are replayed against a renderer that adds a
+second per wake, which is what sleeping one second at a time amounts to.
+
+Run from the repository root:  python benchmarks/timer_drift.py [hours]
+"""
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+NS = main.NS_PER_SECOND
+MAX_DELAY_NS = 2_000_000  # how late the scheduler may wake us
+ALLOWED_DRIFT_NS = 1_000_000
+
+class FakeClock:
+    def __init__(self, start_ns=123_456_789_012):
+        self.now = start_ns
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ns):
+        self.now += ns
+
+def run_stopwatch(hours, rng):
+    clock = FakeClock()
+    engine = main.TimerEngine(clock)
+    engine.select("Stopwatch")
+    engine.start()
+    start = clock()
+    drift = 0
+    naive_ns = 0
+    for second in range(1, int(hours * 3600) + 1):
+        delay = rng.randrange(MAX_DELAY_NS)
+        clock.advance(engine.next_change_ns() + delay)
+        if engine.display_seconds() != second:
+            raise AssertionError(f"stopwatch shows {engine.display_seconds()} s at wake {second}")
+        # The boundary the readout implies, against the true one
+        drift = max(drift, abs(clock() - start - delay - second * NS))
+        naive_ns += NS + delay
+    naive_drift = naive_ns - second * NS
+    return drift, naive_drift
+
+def run_countdown(hours, rng):
+    clock = FakeClock()
+    engine = main.TimerEngine(clock)
+    engine.select("Timer")
+    engine.adjust(int(hours * 3600))
+    engine.start()
+    start = clock()
+    drift = 0
+    expected = int(hours * 3600)
+    while engine.next_change_ns() is not None:
+        delay = rng.randrange(MAX_DELAY_NS)
+        clock.advance(engine.next_change_ns() + delay)
+        expected -= 1
+        if engine.display_seconds() != expected:
+            raise AssertionError(f"timer shows {engine.display_seconds()} s, expected {expected} s")
+        # The readout drops to `expected` one nanosecond after the boundary
+        boundary = (int(hours * 3600) - expected - 1) * NS + 1
+        drift = max(drift, abs(clock() - start - delay - boundary))
+    if expected != 0:
+        raise AssertionError(f"countdown stopped at {expected} s")
+    return drift
+
+def run(hours=12.0):
+    rng = random.Random(1)
+    stopwatch_drift, naive_drift = run_stopwatch(hours, rng)
+    countdown_drift = run_countdown(hours, rng)
+    print(f"{hours:g} h with wakeups up to {MAX_DELAY_NS / 1e6:g} ms late:")
+    print(f"  stopwatch drift  {stopwatch_drift / 1e6:.6f} ms")
+    print(f"  countdown drift  {countdown_drift / 1e6:.6f} ms")
+    print(f"  one second per wake would be {naive_drift / 1e9:.1f} s behind")
+    ok = max(stopwatch_drift, countdown_drift) < ALLOWED_DRIFT_NS
+    print("OK" if ok else "FAIL: drift over 1 ms")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if run(float(sys.argv[1]) if len(sys.argv) > 1 else 12.0) else 1)
@@ -0,0 +1,67 @@
+"""
+Drawing k different numbers from 1..n with UniqueDraw, for k up to a
+million and n up to a trillion, against random.sample(range(n), k) for
+reference. Reports the time per draw and the peak memory, which should grow
+with k and not with n (UniqueDraw keeps only its swap dict; the numbers go to
+a file), and checks that every draw is k distinct numbers in range.
+k = n = 10**6 is a full shuffle, the worst case for the swap dict.
+
+Run from the repository root:  python benchmarks/unique.py [max_k]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+RANGES = (10**6, 10**12)
+# UniqueDraw streams its numbers here; they are read back to check them
+SAMPLE_PATH = os.path.join(tempfile.mkdtemp(prefix="xi-bench-"), "unique.txt")
+
+def draw_all(n, k):
+    draw = main.UniqueDraw(n, k, SAMPLE_PATH)
+    while not draw.done():
+        draw.step()
+    return draw
+
+def read_draw(draw):
+    with open(draw.path) as f:
+        return [int(line) for line in f]
+
+def measure(sampler, collect, n, k):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = sampler(n, k)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    values = collect(result)
+    if len(values) != k or len(set(values)) != k or not all(1 <= v <= n for v in values):
+        raise AssertionError(f"bad sample of {k} from 1..{n}")
+    del values, result
+    # Time without tracemalloc slowing it down
+    started = time.perf_counter()
+    sampler(n, k)
+    return time.perf_counter() - started, peak
+
+def run(max_k=10**6):
+    samplers = (("UniqueDraw", draw_all, read_draw),
+                ("random.sample", lambda n, k: [v + 1 for v in random.sample(range(n), k)], lambda values: values))
+    print(f"{'n':>15}{'k':>10}  {'sampler':<15}{'total ms':>10}{'us/draw':>9}{'peak MB':>9}")
+    for n in RANGES:
+        k = 10
+        while k <= min(max_k, n):
+            for name, sampler, collect in samplers:
+                elapsed, peak = measure(sampler, collect, n, k)
+                print(f"{n:>15,}{k:>10,}  {name:<15}{elapsed * 1000:>10.1f}"
+                      f"{elapsed * 1e6 / k:>9.2f}{peak / 2**20:>9.1f}")
+            k *= 100 if k < 10**5 else 10
+
+if __name__ == "__main__":
+    run(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10**6)
@@ -5,21 +5,117 @@ import datetime
 import random
 import os
 import time
-import re
+import json
+import queue
+import atexit
+import threading
+import signal
+import math
+from collections import Counter, OrderedDict, deque
+
+startup_started = time.perf_counter()
+time_to_first_frame = None
 
 # Setup driver settings (for systems using framebuffer; remove if not needed)
 os.environ["SDL_VIDEODRIVERS"] = "fbcon"
 os.environ["SDL_FBDEV"] = "/dev/fb1"
 
-pygame.init()
-
 # ----------------------
 # Global Settings
 # ----------------------
 SCREEN_WIDTH = 480
 SCREEN_HEIGHT = 320
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Xi Smartwatch")
+screen = None
+
+def init_display():
+    """
+    Opens the display. Only the display and font modules are started; the watch
+    never uses the other pygame subsystems, so pygame.init() is skipped.
+    """
+    global screen
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Xi Smartwatch")
+    return screen
+
+# ----------------------
+# Display Layer
+# ----------------------
+class DirtyDisplay:
+    """
+    Collects the regions invalidated during a frame and pushes only those to
+    the panel with pygame.display.update(rects). Frames with nothing dirty are
+    not pushed at all.
+    """
+    def __init__(self, size):
+        self.bounds = pygame.Rect((0, 0), size)
+        self.dirty = []
+        self.full = False
+        self.frames = 0
+        self.pushes = 0
+        self.last_pixels = 0
+        self.total_pixels = 0
+
+    def invalidate(self, rect):
+        if self.full:
+            return
+        rect = pygame.Rect(rect).clip(self.bounds)
+        if rect.width and rect.height:
+            self.dirty.append(rect)
+
+    def invalidate_all(self):
+        self.full = True
+        self.dirty = []
+
+    def merged_rects(self):
+        """
+        Returns the dirty rects with overlapping ones merged, so no pixel is
+        pushed twice.
+        """
+        if self.full:
+            return [self.bounds.copy()]
+        rects = []
+        for rect in self.dirty:
+            rect = rect.copy()
+            merged = True
+            while merged:
+                merged = False
+                for other in rects:
+                    if rect.colliderect(other):
+                        rects.remove(other)
+                        rect.union_ip(other)
+                        merged = True
+                        break
+            rects.append(rect)
+        return rects
+
+    def present(self):
+        """
+        Pushes the dirty regions of this frame and returns how many pixels
+        were sent to the panel.
+        """
+        surface = pygame.display.get_surface()
+        if profiler.enabled:
+            self.invalidate(profiler.draw_overlay(surface))
+        rects = self.merged_rects()
+        if rects:
+            pygame.display.update(rects)
+            self.pushes += 1
+        if profiler.enabled:
+            profiler.restore(surface)
+        pixels = sum(rect.width * rect.height for rect in rects)
+        self.frames += 1
+        self.last_pixels = pixels
+        self.total_pixels += pixels
+        self.dirty = []
+        self.full = False
+        return pixels
+
+    def pixels_per_frame(self):
+        return self.total_pixels / self.frames if self.frames else 0
+
+display = DirtyDisplay((SCREEN_WIDTH, SCREEN_HEIGHT))
 
 # Colors
 BLACK      = (0, 0, 0)
@@ -33,33 +129,763 @@ LIGHT_GRAY = (217, 217, 217)
 BLUE       = (100, 149, 237)
 BRIGHT_GOLD = (255, 215, 0)
 
-# Touch calibration settings
-SWAP_XY = True       # Set to True if X and Y axes are swapped
-INVERT_X = False     # Set to True if X axis is inverted
-INVERT_Y = False     # Set to True if Y axis is inverted
+# ----------------------
+# Frame Profiler
+# ----------------------
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "xi_profile.csv")
+PROFILER_FRAMES = 240
+PROFILER_TOGGLE_KEY = pygame.K_F3
+PROFILER_DUMP_KEY = pygame.K_F4
+
+class FrameProfiler:
+    """
+    Records how long each phase of every frame takes into a ring buffer of the
+    last PROFILER_FRAMES frames, and draws them as a stacked frame-time graph in
+    the top-right corner. The main loop calls begin_frame(), mark(phase) after
+    each phase and end_frame() after the frame limiter; mark() charges the time
+    since the previous mark to that phase. While disabled each call returns
+    straight away.
+    """
+    PHASES = ("events", "update", "draw", "present", "idle")
+    PHASE_COLORS = (BLUE, GOLD, RED, WHITE)  # idle is left out of the graph
+    GRAPH_WIDTH, GRAPH_HEIGHT = PROFILER_FRAMES // 2, 40
+    MS_PER_PIXEL = 1.0
+    TEXT_EVERY = 15  # frames between refreshes of the text line
+
+    def __init__(self, frames=PROFILER_FRAMES):
+        self.enabled = False
+        self.phase_index = {phase: i for i, phase in enumerate(self.PHASES)}
+        self.ring = [[0.0] * len(self.PHASES) for _ in range(frames)]
+        self.index = 0
+        self.count = 0
+        self.current = self.ring[0]
+        self.last = 0.0
+        self.rect = pygame.Rect(SCREEN_WIDTH - self.GRAPH_WIDTH - 14, 14, self.GRAPH_WIDTH, self.GRAPH_HEIGHT + 16)
+        self.overlay = None
+        self.saved = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.index = self.count = 0
+            self.current = self.ring[0]
+            self.current[:] = [0.0] * len(self.PHASES)
+            self.last = time.perf_counter()
+            if self.overlay is None:
+                self.overlay = pygame.Surface(self.rect.size)
+                self.saved = pygame.Surface(self.rect.size)
+            self.overlay.fill(DARK_GRAY)
+        else:
+            # Push the screen contents the overlay was covering
+            display.invalidate(self.rect)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == PROFILER_TOGGLE_KEY:
+                self.toggle()
+            elif event.key == PROFILER_DUMP_KEY:
+                self.dump()
+
+    def begin_frame(self):
+        if self.enabled:
+            self.current[:] = [0.0] * len(self.PHASES)
+            self.last = time.perf_counter()
+
+    def mark(self, phase):
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[self.phase_index[phase]] += now - self.last
+            self.last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.mark("idle")
+        self.draw_column(self.current)
+        self.count += 1
+        if self.count % self.TEXT_EVERY == 0:
+            self.draw_text()
+        self.index = (self.index + 1) % len(self.ring)
+        self.current = self.ring[self.index]
+
+    def frames(self):
+        """
+        Returns the recorded frames, oldest first, as lists of seconds per phase.
+        """
+        size = len(self.ring)
+        if self.count < size:
+            return self.ring[:self.count]
+        return self.ring[self.index:] + self.ring[:self.index]
+
+    def dump(self, path=PROFILE_PATH):
+        frames = self.frames()
+        with open(path, "w") as f:
+            f.write("frame," + ",".join(phase + "_ms" for phase in self.PHASES) + ",total_ms\n")
+            for i, frame in enumerate(frames):
+                values = [seconds * 1000 for seconds in frame]
+                f.write(f"{i}," + ",".join(f"{ms:.3f}" for ms in values) + f",{sum(values):.3f}\n")
+        print(f"Profiler: wrote {len(frames)} frames to {path}")
+
+    def draw_column(self, frame):
+        """
+        Scrolls the graph one pixel left and draws this frame's phases stacked in
+        the new right-hand column, so each frame costs one column, not a redraw.
+        """
+        graph = self.overlay.subsurface((0, 16, self.GRAPH_WIDTH, self.GRAPH_HEIGHT))
+        graph.scroll(-1, 0)
+        x = self.GRAPH_WIDTH - 1
+        graph.fill(DARK_GRAY, (x, 0, 1, self.GRAPH_HEIGHT))
+        bottom = self.GRAPH_HEIGHT
+        for seconds, color in zip(frame, self.PHASE_COLORS):
+            height = int(seconds * 1000 / self.MS_PER_PIXEL + 0.5)
+            if height:
+                graph.fill(color, (x, bottom - height, 1, height))
+                bottom -= height
+                if bottom <= 0:
+                    break
+        # 30 fps budget line, behind the bars
+        budget_y = self.GRAPH_HEIGHT - int(1000 / 30 / self.MS_PER_PIXEL)
+        if 0 <= budget_y < bottom:
+            graph.set_at((x, budget_y), GRAY)
+
+    def draw_text(self):
+        recent = [self.ring[(self.index - i) % len(self.ring)] for i in range(min(self.count, self.TEXT_EVERY))]
+        busy = [sum(frame[:-1]) * 1000 for frame in recent]
+        line = f"{sum(busy) / len(busy):.1f} ms avg  {max(busy):.1f} max"
+        # Rendered directly: a fresh string every refresh would only churn the text cache
+        text = get_font(None, 16).render(line, True, WHITE)
+        self.overlay.fill(DARK_GRAY, (0, 0, self.GRAPH_WIDTH, 16))
+        self.overlay.blit(text, (2, 2))
+
+    def draw_overlay(self, surface):
+        """
+        Draws the overlay, keeping a copy of what it covers for restore().
+        """
+        self.saved.blit(surface, (0, 0), self.rect)
+        surface.blit(self.overlay, self.rect)
+        return self.rect
+
+    def restore(self, surface):
+        surface.blit(self.saved, self.rect)
+
+profiler = FrameProfiler()
 
 # ----------------------
 # Fonts Initialization
 # ----------------------
-pygame.font.init()
-font_time   = pygame.font.SysFont("Rubik", 88)
-font_date   = pygame.font.SysFont("Rubik", 38)
-font_button = pygame.font.SysFont("Rubik", 30)
-app_font = pygame.font.SysFont(None, 30)
-numgen_font       = pygame.font.SysFont(None, 36)
-numgen_large_font = pygame.font.SysFont(None, 48)
+# Every (face, size) is loaded once and shared by all screens
+font_registry = {}
+
+def get_font(face, size, system=True):
+    """
+    Returns the font for (face, size), loading it on first use. System fonts go
+    through SysFont; with system=False the face is a path to a font file.
+    """
+    key = (face, size, system)
+    font = font_registry.get(key)
+    if font is None:
+        font = pygame.font.SysFont(face, size) if system else pygame.font.Font(face, size)
+        font_registry[key] = font
+    return font
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces keyed by (font, text, antialias, color),
+    capped by the bytes of pixel data it holds. Returned surfaces are shared and
+    must not be drawn on.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self.entries and self.bytes + size > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+            self.evictions += 1
+        self.entries[key] = surface
+        self.bytes += size
+        return surface
+
+    def stats(self):
+        return {"entries": len(self.entries), "bytes": self.bytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+TEXT_CACHE_BYTES = 2 * 1024 * 1024
+text_cache = TextCache(TEXT_CACHE_BYTES)
+
+class AppAssets:
+    """
+    Loads one app's fonts and images the first time the app needs them.
+    prefetch() starts the same load on a background thread, so it is usually
+    finished by the time the app is opened; load() waits for it if not.
+    """
+    def __init__(self, loader):
+        self.loader = loader
+        self.loaded = False
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def load(self):
+        with self.lock:
+            if not self.loaded:
+                self.loader()
+                self.loaded = True
+
+    def prefetch(self):
+        if self.loaded or self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.load, daemon=True)
+        self.thread.start()
+
+font_time = font_date = font_button = None
+app_font = None
+
+def load_home_assets():
+    global font_time, font_date, font_button
+    font_time   = get_font("Rubik", 88)
+    font_date   = get_font("Rubik", 38)
+    font_button = get_font("Rubik", 30)
+
+def load_menu_assets():
+    global app_font
+    app_font = get_font(None, 30)
+
+home_assets = AppAssets(load_home_assets)
+menu_assets = AppAssets(load_menu_assets)
+
+# ----------------------
+# Asset Manager
+# ----------------------
+class AssetManager:
+    """
+    Loads each image once, converts it to the display pixel format and hands out
+    the shared surface. Images with transparent pixels keep per-pixel alpha
+    (convert_alpha), fully opaque ones are converted without it.
+    """
+    def __init__(self):
+        self.surfaces = {}
+        self.masks = {}
+        self.blit_costs = {}
+
+    def image(self, path):
+        surface = self.surfaces.get(path)
+        if surface is None:
+            raw = pygame.image.load(path)
+            if self.has_transparency(raw):
+                surface = raw.convert_alpha()
+            else:
+                surface = raw.convert()
+            self.surfaces[path] = surface
+        return surface
+
+    def mask(self, path):
+        """
+        Returns the collision mask of an image, built once from its opaque pixels.
+        """
+        mask = self.masks.get(path)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.image(path))
+            self.masks[path] = mask
+        return mask
+
+    @staticmethod
+    def has_transparency(surface):
+        if not surface.get_flags() & pygame.SRCALPHA:
+            return surface.get_colorkey() is not None
+        opaque = pygame.mask.from_surface(surface, 254).count()
+        return opaque < surface.get_width() * surface.get_height()
+
+    def memory_bytes(self, path):
+        surface = self.surfaces[path]
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def measure_blit_costs(self, target, repeats=100):
+        """
+        Times repeated blits of every loaded asset onto target and stores the
+        average cost per blit in microseconds.
+        """
+        for path, surface in self.surfaces.items():
+            start = time.perf_counter()
+            for _ in range(repeats):
+                target.blit(surface, (0, 0))
+            self.blit_costs[path] = (time.perf_counter() - start) / repeats * 1e6
+        return self.blit_costs
+
+    def report(self):
+        """
+        Returns one row per asset: path, size, bytes in memory, whether it kept
+        per-pixel alpha, and the last measured blit cost (None if never measured).
+        """
+        rows = []
+        for path, surface in self.surfaces.items():
+            rows.append({
+                "path": path,
+                "size": surface.get_size(),
+                "bytes": self.memory_bytes(path),
+                "alpha": bool(surface.get_flags() & pygame.SRCALPHA),
+                "blit_us": self.blit_costs.get(path),
+            })
+        return rows
+
+assets = AssetManager()
+
+# ----------------------
+# Persistent State
+# ----------------------
+STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "xi_state.journal")
+
+class StateStore:
+    """
+    Durable key/value store for app state such as the Golden Pony high score.
+
+    Every change is appended to a journal of JSON lines. A background thread
+    writes queued changes in batches with one fsync per batch, so the render
+    loop never waits on storage. Once the journal holds compact_after records
+    it is rewritten as one record per key into a temp file that atomically
+    replaces it. A torn last line left by a power cut is dropped on load.
+    """
+    def __init__(self, path, compact_after=200, batch_delay=0.25):
+        self.path = path
+        self.compact_after = compact_after
+        self.batch_delay = batch_delay
+        self.values = {}
+        self.written = {}
+        self.records = 0
+        self.pending = queue.Queue()
+        if self.load():
+            self.compact()
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def load(self):
+        """
+        Reads the journal into memory. Returns True if it ended in a torn or
+        corrupt record and needs rewriting before anything is appended.
+        """
+        try:
+            with open(self.path, "r") as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return False
+        torn = lines.pop() != ""
+        for line in lines:
+            try:
+                record = json.loads(line)
+                key, value = record["k"], record["v"]
+            except (ValueError, KeyError, TypeError):
+                torn = True
+                break
+            self.values[key] = value
+            self.records += 1
+        self.written = dict(self.values)
+        return torn
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        if key in self.values and self.values[key] == value:
+            return
+        self.values[key] = value
+        self.pending.put((key, value))
+
+    def flush(self):
+        """
+        Blocks until every change made so far is on disk.
+        """
+        self.pending.join()
+
+    def write_loop(self):
+        while True:
+            batch = [self.pending.get()]
+            # Give changes made in quick succession a chance to share one fsync
+            time.sleep(self.batch_delay)
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, "a") as f:
+                    for key, value in batch:
+                        f.write(json.dumps({"k": key, "v": value}) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                for key, value in batch:
+                    self.written[key] = value
+                self.records += len(batch)
+                if self.records >= self.compact_after:
+                    self.compact()
+            except OSError as e:
+                print(f"Failed to save state: {e}")
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+    def compact(self):
+        """
+        Rewrites the journal as a snapshot of the written values via a temp file
+        and an atomic rename, so a crash leaves either the old or the new file.
+        """
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                for key, value in self.written.items():
+                    f.write(json.dumps({"k": key, "v": value}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.records = len(self.written)
+            try:
+                dir_fd = os.open(os.path.dirname(self.path) or ".", os.O_RDONLY)
+            except OSError:
+                return
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError as e:
+            print(f"Failed to compact state: {e}")
+
+state_store = None
+
+def open_state_store(path=STATE_PATH):
+    """
+    Opens the state store once at startup and loads the values the apps keep in memory.
+    """
+    global state_store, high_score, secure_random
+    state_store = StateStore(path)
+    atexit.register(state_store.flush)
+    high_score = state_store.get("golden_pony.high_score", LEGACY_HIGH_SCORE)
+    secure_random = state_store.get(SECURE_RANDOM_KEY, False)
+    calibration = state_store.get(CALIBRATION_KEY)
+    if calibration is not None:
+        touch_input.set_calibration(calibration)
+    return state_store
 
 # ----------------------
-# Screen States
+# Touch Input
 # ----------------------
-HOME_SCREEN = 0
-APP_SCREEN = 1
-NUMGEN_SCREEN = 3
-COMPLEX_APP_SCREEN = 4
-TIMER_SCREEN = 5
+JITTER_RADIUS = 2  # px; pointer moves shorter than this are treated as noise
 
-current_screen = HOME_SCREEN
-transition_in_progress = False
+def calibration_from_flags(swap_xy, invert_x, invert_y):
+    """
+    Builds the affine calibration matrix equivalent to the old axis flags.
+    """
+    row_x, row_y = ((0.0, 1.0, 0.0), (1.0, 0.0, 0.0)) if swap_xy else ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0))
+    if invert_x:
+        row_x = (-row_x[0], -row_x[1], SCREEN_WIDTH - row_x[2])
+    if invert_y:
+        row_y = (-row_y[0], -row_y[1], SCREEN_HEIGHT - row_y[2])
+    return (row_x, row_y, (0.0, 0.0, 1.0))
+
+def _solve3(matrix, vector):
+    """
+    Solves a 3x3 linear system by Gaussian elimination with partial pivoting.
+    """
+    rows = [list(matrix[i]) + [vector[i]] for i in range(3)]
+    for col in range(3):
+        pivot = max(range(col, 3), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-9:
+            raise ValueError("calibration points are collinear")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, 3):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, 4):
+                rows[r][c] -= factor * rows[col][c]
+    solution = [0.0, 0.0, 0.0]
+    for r in (2, 1, 0):
+        solution[r] = (rows[r][3] - sum(rows[r][c] * solution[c] for c in range(r + 1, 3))) / rows[r][r]
+    return tuple(solution)
+
+def fit_affine(raw_points, screen_points):
+    """
+    Least-squares fit of the affine matrix taking raw touch points onto the
+    screen points they were aimed at. Needs at least three points that are
+    not on one line; more points average out tap error.
+    """
+    if len(raw_points) < 3 or len(raw_points) != len(screen_points):
+        raise ValueError("need three or more matching calibration points")
+    ata = [[0.0] * 3 for _ in range(3)]
+    atx = [0.0] * 3
+    aty = [0.0] * 3
+    for (rx, ry), (sx, sy) in zip(raw_points, screen_points):
+        row = (rx, ry, 1.0)
+        for i in range(3):
+            for j in range(3):
+                ata[i][j] += row[i] * row[j]
+            atx[i] += row[i] * sx
+            aty[i] += row[i] * sy
+    return (_solve3(ata, atx), _solve3(ata, aty), (0.0, 0.0, 1.0))
+
+class InputPipeline:
+    """
+    The one place pointer input enters the watch. Every mouse/touch event is
+    mapped through the affine calibration matrix before any scene sees it
+    (the raw position is kept as raw_pos), motion within JITTER_RADIUS of the
+    last accepted position is dropped, and once per frame the calibrated
+    pointer position and button state are snapshotted into pos and pressed,
+    so scenes never query pygame.mouse themselves. A drag that floods the
+    queue with motion events reaches the scene as one event per frame.
+    """
+    POINTER_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+    def __init__(self, matrix):
+        self.set_calibration(matrix)
+        self.pos = (0, 0)
+        self.pressed = (False, False, False)
+        self.coalesce = True
+        self.filtered = 0
+        self.coalesced = 0
+
+    def set_calibration(self, matrix):
+        self.matrix = tuple(tuple(row) for row in matrix)
+
+    def calibrate(self, raw):
+        (a, b, c), (d, e, f), _ = self.matrix
+        x, y = raw
+        return (min(max(int(round(a * x + b * y + c)), 0), SCREEN_WIDTH - 1),
+                min(max(int(round(d * x + e * y + f)), 0), SCREEN_HEIGHT - 1))
+
+    def add_motion(self, processed, event):
+        pos = self.calibrate(event.pos)
+        dx, dy = pos[0] - self.pos[0], pos[1] - self.pos[1]
+        if dx * dx + dy * dy < JITTER_RADIUS * JITTER_RADIUS:
+            self.filtered += 1
+            return
+        self.pos = pos
+        processed.append(pygame.event.Event(pygame.MOUSEMOTION,
+                                            dict(event.dict, pos=pos, rel=(dx, dy), raw_pos=event.pos)))
+
+    def process(self, events):
+        """
+        Returns the frame's events with pointer events calibrated, each run of
+        motion events coalesced into one carrying the latest position and the
+        net rel, and jitter dropped. Also refreshes the snapshot.
+        """
+        processed = []
+        motion = None  # latest motion event of the current run
+        for event in events:
+            if event.type == pygame.MOUSEMOTION and self.coalesce:
+                if motion is not None:
+                    self.coalesced += 1
+                motion = event
+                continue
+            if motion is not None:
+                # Button events keep their place after the motion that led up to them
+                self.add_motion(processed, motion)
+                motion = None
+            if event.type == pygame.MOUSEMOTION:
+                self.add_motion(processed, event)
+            elif event.type in self.POINTER_EVENTS:
+                self.pos = self.calibrate(event.pos)
+                processed.append(pygame.event.Event(event.type, dict(event.dict, pos=self.pos, raw_pos=event.pos)))
+            else:
+                processed.append(event)
+        if motion is not None:
+            self.add_motion(processed, motion)
+        # One read of the pointer per frame, through the same calibration and filter
+        pos = self.calibrate(pygame.mouse.get_pos())
+        dx, dy = pos[0] - self.pos[0], pos[1] - self.pos[1]
+        if dx * dx + dy * dy >= JITTER_RADIUS * JITTER_RADIUS:
+            self.pos = pos
+        self.pressed = pygame.mouse.get_pressed()
+        return processed
+
+# Calibration used until one is fitted and saved
+SWAP_XY = True       # Set to True if X and Y axes are swapped
+INVERT_X = False     # Set to True if X axis is inverted
+INVERT_Y = False     # Set to True if Y axis is inverted
+CALIBRATION_KEY = "input.calibration"
+
+touch_input = InputPipeline(calibration_from_flags(SWAP_XY, INVERT_X, INVERT_Y))
+
+# ----------------------
+# Scenes
+# ----------------------
+class Scene:
+    """
+    One screen of the watch. Every frame the scene manager passes the scene
+    each pending event through handle_event(), then calls update(dt) and
+    render(surface); render draws only what changed and invalidates it on the
+    display. enter() runs whenever the scene comes to the top of the stack,
+    and by default forces a full repaint.
+    """
+    fps = 30
+    # Event types the scene handles; the rest are kept off the queue while it is on top
+    events = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.KEYDOWN)
+
+    def enter(self):
+        self.last_state = None
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def render(self, surface):
+        pass
+
+    def next_change(self):
+        """
+        Seconds until the scene would draw something new without any input, or
+        None while it animates and needs every frame.
+        """
+        return None
+
+# Every event type pygame knows by name, below the user event range; a scene's
+# complement of these is blocked so touch floods (FINGERMOTION) never reach it
+EVENT_TYPES = sorted({value for name, value in vars(pygame).items()
+                      if name.isupper() and type(value) is int and 0 < value < pygame.USEREVENT
+                      and pygame.event.event_name(value) != "Unknown"})
+
+# While idle, the queue is checked every IDLE_POLL_MIN seconds at first, backing
+# off to IDLE_POLL_MAX the longer nothing happens. pygame.event.wait() is not
+# used: it polls SDL every millisecond, which costs more than drawing at 30 fps.
+IDLE_POLL_MIN = 0.01
+IDLE_POLL_MAX = 0.05
+
+class SceneManager:
+    """
+    Runs the watch as a single loop over a stack of scenes, of which only the
+    top one is live. push/pop/replace requested during a frame take effect
+    once that frame has been presented, so a scene never changes under its own
+    hooks. Frame pacing, profiling and the display push are done here, once,
+    for every app.
+
+    With idle on, a scene that reports it will not change for a while is not
+    redrawn at its fps: the loop sleeps until its next_change() or the next
+    input event, whichever comes first.
+    """
+    def __init__(self):
+        self.stack = []
+        self.pending = []
+        self.running = False
+        self.idle = True
+        self.idle_wakeups = 0
+        self.held_events = []
+
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        self.pending.append(scene)
+
+    def pop(self):
+        self.pending.append(None)
+
+    def replace(self, scene):
+        self.pop()
+        self.push(scene)
+
+    def quit(self):
+        self.running = False
+
+    def apply_transitions(self):
+        """
+        Applies the queued stack changes and returns True if the top scene changed.
+        """
+        previous = self.top()
+        for scene in self.pending:
+            if scene is None:
+                self.stack.pop()
+            else:
+                self.stack.append(scene)
+        self.pending = []
+        if self.top() is previous or not self.stack:
+            return False
+        self.top().enter()
+        self.allow_events(self.top())
+        return True
+
+    def allow_events(self, scene):
+        """
+        Lets the event types the scene handles onto the queue, plus QUIT and
+        KEYDOWN for the profiler keys, and blocks every other type by name.
+        set_blocked(None) is not used: it makes SDL drop every queued event,
+        including a QUIT or tap from this frame, while blocking a list only
+        drops queued events of the listed types.
+        """
+        allowed = [pygame.QUIT, pygame.KEYDOWN] + list(scene.events)
+        pygame.event.set_allowed(allowed)
+        pygame.event.set_blocked([t for t in EVENT_TYPES if t not in allowed])
+
+    def wait_for_input(self, timeout):
+        """
+        Sleeps until an event arrives or timeout seconds have passed. Events
+        are taken off the queue and held for the next frame; pygame.event.peek()
+        is avoided because dropping the event it returns corrupts posted events.
+        """
+        deadline = time.perf_counter() + timeout
+        poll = IDLE_POLL_MIN
+        while True:
+            self.held_events = pygame.event.get()
+            if self.held_events:
+                return
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(poll, remaining))
+            self.idle_wakeups += 1
+            poll = min(poll * 2, IDLE_POLL_MAX)
+
+    def run(self, *scenes):
+        """
+        Starts with the given scenes stacked bottom to top and runs frames until
+        the stack empties or the window is closed.
+        """
+        global time_to_first_frame
+        self.stack = []
+        self.held_events = []
+        self.pending = list(scenes)
+        self.apply_transitions()
+        self.running = True
+        dt = 0.0
+        while self.running and self.stack:
+            profiler.begin_frame()
+            scene = self.top()
+            events = touch_input.process(self.held_events + pygame.event.get())
+            self.held_events = []
+            for event in events:
+                profiler.handle_event(event)
+                if event.type == pygame.QUIT:
+                    self.quit()
+                else:
+                    scene.handle_event(event)
+            profiler.mark("events")
+            scene.update(dt)
+            profiler.mark("update")
+            scene.render(screen)
+            profiler.mark("draw")
+            display.present()
+            profiler.mark("present")
+            if time_to_first_frame is None:
+                time_to_first_frame = time.perf_counter() - startup_started
+            changed = self.apply_transitions()
+            dt = clock.tick(scene.fps) / 1000.0
+            if self.idle and not changed and self.running:
+                wait = scene.next_change()
+                if wait is not None and wait > 0:
+                    self.wait_for_input(wait)
+            profiler.end_frame()
+
+clock = pygame.time.Clock()
+scene_manager = SceneManager()
 
 # ----------------------
 # Button settings for home screen
@@ -73,20 +899,18 @@ button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
 # ----------------------
 # App Menu (scrollable) settings
 # ----------------------
-menu_items = ["Timer", "Number Generator", "Golden Pony"]
+menu_items = ["Timer", "Number Generator", "Raffle", "Picker", "Golden Pony", "Calibrate"]
 item_height = 65
 spacing = 25
 visible_items = 3
-scroll_offset = 0
-min_scroll = -(len(menu_items) - visible_items) * (item_height + spacing)
 max_scroll = 0
 
 # ----------------------
 # Helper Functions for Main App
 # ----------------------
-def draw_rounded_rect(surface, rect, color, radius):
+def _draw_rounded_rect_primitives(surface, rect, color, radius):
     """
-    Draws a filled rectangle with rounded corners.
+    Draws a filled rectangle with rounded corners from rect and circle primitives.
     """
     rect = pygame.Rect(rect)
     inner_rect = rect.inflate(-2 * radius, -2 * radius)
@@ -104,94 +928,233 @@ def draw_rounded_rect(surface, rect, color, radius):
     pygame.draw.circle(surface, color, (rect.left + radius, rect.bottom - radius), radius)
     pygame.draw.circle(surface, color, (rect.right - radius, rect.bottom - radius), radius)
 
-def draw_rounded_rect_outline(surface, rect, color, radius, width):
+# Rounded rect shapes keyed by (size, color, radius); each is built once and blitted
+rounded_rect_cache = {}
+ROUNDED_RECT_CACHE_LIMIT = 64
+
+def get_rounded_rect_surface(size, color, radius):
+    """
+    Returns a cached colorkeyed surface holding a filled rounded rect of the given size.
+    """
+    key = (tuple(size), tuple(color), radius)
+    shape = rounded_rect_cache.get(key)
+    if shape is None:
+        if len(rounded_rect_cache) >= ROUNDED_RECT_CACHE_LIMIT:
+            rounded_rect_cache.clear()
+        shape = pygame.Surface(size)
+        colorkey = WHITE if tuple(color)[:3] == BLACK else BLACK
+        shape.fill(colorkey)
+        _draw_rounded_rect_primitives(shape, shape.get_rect(), color, radius)
+        shape.set_colorkey(colorkey, pygame.RLEACCEL)
+        rounded_rect_cache[key] = shape
+    return shape
+
+def draw_rounded_rect(surface, rect, color, radius):
+    """
+    Draws a filled rectangle with rounded corners.
+    """
+    rect = pygame.Rect(rect)
+    if rect.width <= 0 or rect.height <= 0:
+        _draw_rounded_rect_primitives(surface, rect, color, radius)
+        return
+    surface.blit(get_rounded_rect_surface(rect.size, color, radius), rect)
+
+def _draw_rounded_rect_outline_primitives(surface, rect, color, radius, width):
     """
     Draws an outline of a rounded rectangle by drawing successive rounded rects.
     """
     for i in range(width):
         shrunk_rect = pygame.Rect(rect.left + i, rect.top + i, rect.width - 2 * i, rect.height - 2 * i)
         current_radius = max(0, radius - i)
-        draw_rounded_rect(surface, shrunk_rect, color, current_radius)
-
-def transform_coords(pos):
-    """
-    Transforms touch input coordinates based on calibration settings.
-    """
-    x, y = pos
-    if SWAP_XY:
-        x, y = y, x
-    if INVERT_X:
-        x = SCREEN_WIDTH - x
-    if INVERT_Y:
-        y = SCREEN_HEIGHT - y
-    return (x, y)
-
-def run_app_menu(surface):
-    global scroll_offset
-    clock = pygame.time.Clock()
-    running = True
-    dragging = False
+        _draw_rounded_rect_primitives(surface, shrunk_rect, color, current_radius)
+
+# Outline shapes keyed by (size, radius, width, color)
+rounded_outline_cache = {}
+
+def draw_rounded_rect_outline(surface, rect, color, radius, width):
+    """
+    Draws an outline of a rounded rectangle. The stacked rounded rects that make
+    up the outline are rendered once into a cached surface, so each call is one blit.
+    """
+    rect = pygame.Rect(rect)
+    if rect.width <= 0 or rect.height <= 0:
+        _draw_rounded_rect_outline_primitives(surface, rect, color, radius, width)
+        return
+    key = (rect.size, radius, width, tuple(color))
+    shape = rounded_outline_cache.get(key)
+    if shape is None:
+        if len(rounded_outline_cache) >= ROUNDED_RECT_CACHE_LIMIT:
+            rounded_outline_cache.clear()
+        shape = pygame.Surface(rect.size)
+        colorkey = WHITE if tuple(color)[:3] == BLACK else BLACK
+        shape.fill(colorkey)
+        _draw_rounded_rect_outline_primitives(shape, shape.get_rect(), color, radius, width)
+        shape.set_colorkey(colorkey, pygame.RLEACCEL)
+        rounded_outline_cache[key] = shape
+    surface.blit(shape, rect)
+
+MENU_ROW_CACHE_ROWS = 24
+
+class VirtualList:
+    """
+    A vertical list of fixed-height rows scrolled inside a viewport. Each row
+    is rendered once per visual state by render_row(index, state) into an LRU
+    cache of at most max_rows surfaces; a frame fills the viewport and blits
+    only the rows that intersect it, clipped to it, so the cost follows the
+    visible rows and not the number of entries. Hit-testing is arithmetic.
+    """
+    def __init__(self, viewport, count, row_height, spacing, top, render_row, background,
+                 max_rows=MENU_ROW_CACHE_ROWS):
+        self.viewport = pygame.Rect(viewport)
+        self.count = count
+        self.row_height = row_height
+        self.pitch = row_height + spacing
+        self.top = top
+        self.render_row = render_row
+        self.background = background
+        self.max_rows = max_rows
+        self.rows = OrderedDict()
+        self.rendered = 0
+
+    def row_y(self, index, offset):
+        """
+        Top of row index, relative to the viewport.
+        """
+        return self.top + index * self.pitch + offset
+
+    def visible_range(self, offset):
+        first = max(0, (-offset - self.top - self.row_height) // self.pitch + 1)
+        last = min(self.count, (self.viewport.height - offset - self.top - 1) // self.pitch + 1)
+        return range(first, max(first, last))
+
+    def index_at(self, pos, offset):
+        """
+        Returns the row under the screen position pos, or None.
+        """
+        if not self.viewport.collidepoint(pos):
+            return None
+        y = pos[1] - self.viewport.y - self.top - offset
+        index = y // self.pitch
+        if 0 <= index < self.count and y - index * self.pitch < self.row_height:
+            return index
+        return None
+
+    def row(self, index, state):
+        key = (index, state)
+        surface = self.rows.get(key)
+        if surface is None:
+            if len(self.rows) >= self.max_rows:
+                self.rows.popitem(last=False)
+            surface = self.rows[key] = self.render_row(index, state)
+            self.rendered += 1
+        else:
+            self.rows.move_to_end(key)
+        return surface
+
+    def draw(self, surface, offset, state_of):
+        """
+        Draws the rows visible at offset; state_of(index) picks each row's state.
+        """
+        clip = surface.get_clip()
+        surface.set_clip(self.viewport)
+        surface.fill(self.background, self.viewport)
+        for index in self.visible_range(offset):
+            surface.blit(self.row(index, state_of(index)),
+                         (self.viewport.x, self.viewport.y + self.row_y(index, offset)))
+        surface.set_clip(clip)
+
+class AppMenuScene(Scene):
+    """
+    The scrollable list of apps. Selecting an entry opens that app on top.
+    """
     scroll_area = pygame.Rect(20, 20, SCREEN_WIDTH - 40, SCREEN_HEIGHT - 40)
 
-    selected_index = 0
+    def __init__(self, items=menu_items):
+        self.items = items
+        self.selected_index = 0
+        self.dragging = False
+        self.hovered = None
+        self.scroll_offset = 0
+        self.min_scroll = min(0, -(len(items) - visible_items) * (item_height + spacing))
+        self.list = VirtualList(self.scroll_area, len(items), item_height, spacing, 10,
+                                self.render_row, LIGHT_GRAY)
+
+    def enter(self):
+        Scene.enter(self)
+        menu_assets.load()
+        self.dragging = False
+        self.scroll_to(self.scroll_offset)
+
+    def render_row(self, index, highlighted):
+        row = pygame.Surface((self.scroll_area.width, item_height)).convert()
+        row.fill(LIGHT_GRAY)
+        if highlighted:
+            draw_rounded_rect(row, row.get_rect(), GOLD, 10)
+            text = text_cache.render(app_font, self.items[index], True, RED)
+        else:
+            draw_rounded_rect(row, row.get_rect(), RED, 10)
+            text = text_cache.render(app_font, self.items[index], True, GOLD)
+        row.blit(text, text.get_rect(center=row.get_rect().center))
+        return row
+
+    def open_app(self, item):
+        scene_manager.push(app_scenes[item.lower().replace(" ", "")]())
+
+    def scroll_to(self, offset):
+        self.scroll_offset = max(self.min_scroll, min(offset, max_scroll))
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.scroll_area.collidepoint(event.pos):
+                self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.dragging = False
+            index = self.list.index_at(event.pos, self.scroll_offset)
+            if index is not None:
+                self.open_app(self.items[index])
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            self.scroll_to(self.scroll_offset + event.rel[1])
+        elif event.type == pygame.KEYDOWN:
+            if event.key in [pygame.K_DOWN, pygame.K_RIGHT]:  # Right scrolls down
+                self.selected_index = (self.selected_index + 1) % len(self.items)
+            elif event.key in [pygame.K_UP, pygame.K_LEFT]:  # Left scrolls up
+                self.selected_index = (self.selected_index - 1) % len(self.items)
+            elif event.key in [pygame.K_RETURN, pygame.K_SPACE]:  # "Select"
+                self.open_app(self.items[self.selected_index])
+                return
+
+            # Auto-scroll so selected item is visible
+            selected_y = self.list.row_y(self.selected_index, 0)
+            if selected_y + self.scroll_offset < 0:
+                self.scroll_to(-selected_y)
+            elif selected_y + item_height + self.scroll_offset > self.scroll_area.height:
+                self.scroll_to(self.scroll_area.height - (selected_y + item_height))
+
+    def update(self, dt):
+        self.hovered = self.list.index_at(touch_input.pos, self.scroll_offset)
+
+    def render(self, surface):
+        # Only repaint when the scroll position or highlight changed
+        state = (self.scroll_offset, self.selected_index, self.hovered)
+        if state == self.last_state:
+            return
+        # Start loading the highlighted app while the user decides
+        for i in (self.hovered, self.selected_index):
+            bundle = app_assets.get(self.items[i].lower().replace(" ", "")) if i is not None else None
+            if bundle is not None:
+                bundle.prefetch()
+        if self.last_state is None:
+            surface.fill(BASE)
+            layer_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
+            draw_rounded_rect(surface, layer_rect, LIGHT_GRAY, 15)
+            display.invalidate_all()
+        else:
+            display.invalidate(self.scroll_area)
+        self.list.draw(surface, self.scroll_offset, lambda i: i == self.hovered or i == self.selected_index)
+        self.last_state = state
 
-    while running:
-        surface.fill(BASE)
-        layer_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
-        draw_rounded_rect(surface, layer_rect, LIGHT_GRAY, 15)
-        scroll_surface = surface.subsurface(scroll_area).copy()
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        adjusted_mouse_y = mouse_y - scroll_area.y
-
-        for i, item in enumerate(menu_items):
-            y_pos = 10 + i * (item_height + spacing) + scroll_offset
-            if 0 <= y_pos <= scroll_area.height - item_height:
-                container_rect = pygame.Rect(0, y_pos, scroll_area.width, item_height)
-
-                if (container_rect.collidepoint(mouse_x - scroll_area.x, adjusted_mouse_y)) or (i == selected_index):
-                    draw_rounded_rect(scroll_surface, container_rect, GOLD, 10)
-                    text = app_font.render(item, True, RED)
-                else:
-                    draw_rounded_rect(scroll_surface, container_rect, RED, 10)
-                    text = app_font.render(item, True, GOLD)
-                text_rect = text.get_rect(center=container_rect.center)
-                scroll_surface.blit(text, text_rect)
-        surface.blit(scroll_surface, scroll_area.topleft)
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if scroll_area.collidepoint(event.pos):
-                    dragging = True
-            elif event.type == pygame.MOUSEBUTTONUP:
-                dragging = False
-                for i, item in enumerate(menu_items):
-                    y_pos = 10 + i * (item_height + spacing) + scroll_offset
-                    container_rect = pygame.Rect(0, y_pos, scroll_area.width, item_height)
-                    if container_rect.collidepoint(event.pos[0] - scroll_area.x, event.pos[1] - scroll_area.y):
-                        return item.lower().replace(" ", "")
-            elif event.type == pygame.MOUSEMOTION and dragging:
-                scroll_offset += event.rel[1]
-                scroll_offset = max(min_scroll, min(scroll_offset, max_scroll))
-            elif event.type == pygame.KEYDOWN:
-                if event.key in [pygame.K_DOWN, pygame.K_RIGHT]:  # Right scrolls down
-                    selected_index = (selected_index + 1) % len(menu_items)
-                elif event.key in [pygame.K_UP, pygame.K_LEFT]:  # Left scrolls up
-                    selected_index = (selected_index - 1) % len(menu_items)
-                elif event.key in [pygame.K_RETURN, pygame.K_SPACE]:  # "Select"
-                    return menu_items[selected_index].lower().replace(" ", "")
-
-                # Auto-scroll so selected item is visible
-                selected_y = 10 + selected_index * (item_height + spacing)
-                if selected_y + scroll_offset < 0:
-                    scroll_offset = -selected_y
-                elif selected_y + item_height + scroll_offset > scroll_area.height:
-                    scroll_offset = scroll_area.height - (selected_y + item_height)
-
-                scroll_offset = max(min_scroll, min(scroll_offset, max_scroll))
-        clock.tick(30)
+    def next_change(self):
+        return float("inf")
 
 # ----------------------
 # Number Generator App
@@ -204,95 +1167,875 @@ knob_radius = 10
 min_val = 1
 max_val = 100
 
+# Bulk draws: values are generated BULK_CHUNK at a time, as many chunks per
+# frame as fit in BULK_FRAME_BUDGET seconds, and appended to BULK_PATH
+BULK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "xi_numbers.txt")
+BULK_COUNTS = (1_000, 100_000, 1_000_000, 10_000_000)
+BULK_CHUNK = 10_000
+BULK_FRAME_BUDGET = 0.012
+HISTOGRAM_BINS = 50
+
+numgen_font = numgen_large_font = numgen_small_font = None
+# NumPy is optional and slow to import, so it is loaded with the app's assets
+numpy = None
+
+def load_numgen_assets():
+    global numgen_font, numgen_large_font, numgen_small_font, numpy
+    numgen_font       = get_font(None, 36)
+    numgen_large_font = get_font(None, 48)
+    numgen_small_font = get_font(None, 24)
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+numgen_assets = AppAssets(load_numgen_assets)
+
+# Secure mode draws from os.urandom through a buffer of ENTROPY_POOL_BYTES, so
+# a system call is made once per few thousand draws instead of once per draw
+ENTROPY_POOL_BYTES = 4096
+SECURE_RANDOM_KEY = "numgen.secure"
+secure_random = False
+
+class EntropyPool(random.Random):
+    """
+    A random.Random whose bits come from os.urandom, read size bytes at a time
+    and handed out from a buffer. Every method of random.Random works on top
+    of getrandbits() and random(); integer ranges (randint, randrange) use its
+    rejection sampling, so they are unbiased. Like random.SystemRandom, the
+    pool cannot be seeded and has no state to save.
+    """
+    def __init__(self, size=ENTROPY_POOL_BYTES):
+        self.size = size
+        self.buffer = b""
+        self.offset = 0
+        self.refills = 0
+        random.Random.__init__(self)
+        # A forked child must not hand out the same bytes as its parent
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self.discard)
+
+    def seed(self, *args, **kwds):
+        return None
+
+    def getstate(self):
+        raise NotImplementedError("EntropyPool has no state")
+
+    def setstate(self, state):
+        raise NotImplementedError("EntropyPool has no state")
+
+    def discard(self):
+        self.buffer = b""
+        self.offset = 0
+
+    def refill(self, n):
+        # Unread bytes are kept; they have not been handed out yet
+        self.buffer = self.buffer[self.offset:] + os.urandom(max(self.size, n))
+        self.offset = 0
+        self.refills += 1
+
+    def randbytes(self, n):
+        if self.offset + n > len(self.buffer):
+            self.refill(n)
+        start = self.offset
+        self.offset += n
+        return self.buffer[start:self.offset]
+
+    # getrandbits() and random() read the buffer inline; they are called once per draw
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        n = (k + 7) // 8
+        start = self.offset
+        if start + n > len(self.buffer):
+            self.refill(n)
+            start = 0
+        self.offset = start + n
+        return int.from_bytes(self.buffer[start:start + n], "little") >> (n * 8 - k)
+
+    def random(self):
+        start = self.offset
+        if start + 7 > len(self.buffer):
+            self.refill(7)
+            start = 0
+        self.offset = start + 7
+        # 56 bits, of which the top 53 make the float
+        return (int.from_bytes(self.buffer[start:start + 7], "little") >> 3) * 2.0 ** -53
+
+entropy_pool = EntropyPool()
+
+def number_rng():
+    """
+    The generator the number apps draw from: the entropy pool in secure mode,
+    the random module's Mersenne Twister otherwise.
+    """
+    return entropy_pool if secure_random else random
+
 def get_value(knob_x):
     ratio = (knob_x - slider_x) / slider_width
     return int(min_val + ratio * (max_val - min_val))
 
+class ChunkedDraw:
+    """
+    A draw of count values that is done a chunk at a time, so that a scene can
+    spread a large draw over many frames. Every value is streamed to a text
+    file, one per line. Subclasses implement step().
+    """
+    def __init__(self, count, path):
+        self.count = count
+        self.path = path
+        self.generated = 0
+        self.out = open(path, "w")
+
+    def done(self):
+        return self.generated >= self.count
+
+    def step(self, size=BULK_CHUNK):
+        """
+        Draws and records the next chunk of at most size values.
+        """
+        raise NotImplementedError
+
+    def write(self, values):
+        self.out.write("\n".join(map(str, values)))
+        self.out.write("\n")
+        self.generated += len(values)
+        if self.done():
+            self.close()
+
+    def run_for(self, seconds):
+        """
+        Draws chunks until seconds have passed, at least one chunk per call.
+        """
+        deadline = time.perf_counter() + seconds
+        while not self.done():
+            self.step()
+            if time.perf_counter() >= deadline:
+                break
+
+    def close(self):
+        if not self.out.closed:
+            self.out.close()
+
+class BulkDraw(ChunkedDraw):
+    """
+    Draws count values uniformly from 1..max_number, keeping a count per
+    value. Uses a single vectorized NumPy call per chunk when NumPy is
+    available and random.choices otherwise. Given the entropy pool as rng,
+    each value is drawn with its unbiased randrange() instead.
+    """
+    def __init__(self, max_number, count, path=BULK_PATH, rng=None):
+        ChunkedDraw.__init__(self, count, path)
+        self.max_number = max_number
+        self.counts = [0] * (max_number + 1)
+        if rng is entropy_pool:
+            self.backend = "secure"
+            self.rng = rng
+        elif rng is not None:
+            self.backend = "python"
+            self.rng = rng
+        elif numpy is not None:
+            self.backend = "numpy"
+            self.rng = numpy.random.default_rng()
+        else:
+            self.backend = "python"
+            self.rng = random.Random()
+
+    def step(self, size=BULK_CHUNK):
+        size = min(size, self.count - self.generated)
+        if self.backend == "secure":
+            randrange = self.rng.randrange
+            stop = self.max_number + 1
+            values = [randrange(1, stop) for _ in range(size)]
+            for value, n in Counter(values).items():
+                self.counts[value] += n
+        elif self.backend == "numpy":
+            values = self.rng.integers(1, self.max_number + 1, size=size)
+            for value, n in enumerate(numpy.bincount(values, minlength=self.max_number + 1).tolist()):
+                self.counts[value] += n
+            values = values.tolist()
+        else:
+            values = self.rng.choices(range(1, self.max_number + 1), k=size)
+            for value, n in Counter(values).items():
+                self.counts[value] += n
+        self.write(values)
+
+    def stats(self):
+        """
+        Returns (mean, standard deviation, min, max) of the values drawn so far.
+        """
+        n = self.generated
+        if not n:
+            return 0.0, 0.0, 0, 0
+        total = sum(value * c for value, c in enumerate(self.counts))
+        squares = sum(value * value * c for value, c in enumerate(self.counts))
+        mean = total / n
+        drawn = [value for value, c in enumerate(self.counts) if c]
+        return mean, math.sqrt(max(0.0, squares / n - mean * mean)), drawn[0], drawn[-1]
+
+    def histogram(self, bins=HISTOGRAM_BINS):
+        """
+        Splits 1..max_number into at most bins ranges and returns the mean
+        count per value in each, so a range holding fewer values than the
+        others is not drawn short.
+        """
+        width = -(-self.max_number // bins)
+        grouped = []
+        for start in range(1, self.max_number + 1, width):
+            span = self.counts[start:start + width]
+            grouped.append(sum(span) / len(span))
+        return grouped
+
 def draw_slider(surface, knob_x):
     pygame.draw.rect(surface, WHITE, (slider_x, slider_y - slider_height // 2, slider_width, slider_height))
     pygame.draw.circle(surface, GOLD, (knob_x, slider_y), knob_radius)
 
+# Numbers of a unique draw kept for display; the rest are only in the file
+UNIQUE_SHOWN = 200
+
+class UniqueDraw(ChunkedDraw):
+    """
+    Draws count different numbers from 1..max_number, in draw order, without
+    ever building the range: a partial Fisher-Yates shuffle of 1..max_number
+    in which only the positions that have been swapped are stored, in a dict.
+    Position i is read (and dropped) when the i-th number is drawn, so time
+    and memory are O(count) even for max_number in the trillions. Only the
+    first UNIQUE_SHOWN numbers are kept in memory; all of them are in the file.
+    """
+    def __init__(self, max_number, count, path=BULK_PATH, rng=random):
+        ChunkedDraw.__init__(self, min(count, max_number), path)
+        self.max_number = max_number
+        self.rng = rng
+        self.swapped = {}
+        self.first = []
+
+    def step(self, size=BULK_CHUNK):
+        swapped = self.swapped
+        randrange = self.rng.randrange
+        n = self.max_number
+        start = self.generated
+        drawn = []
+        for i in range(start, min(start + size, self.count)):
+            j = randrange(i, n)
+            drawn.append(swapped.get(j, j) + 1)
+            # Position j now holds what was at position i, which is never read again
+            if j != i:
+                swapped[j] = swapped.pop(i, i)
+            else:
+                swapped.pop(i, None)
+        if len(self.first) < UNIQUE_SHOWN:
+            self.first.extend(drawn[:UNIQUE_SHOWN - len(self.first)])
+        self.write(drawn)
+
+def format_count(n):
+    """
+    Short form of a count for button labels: 1000 -> 1K, 10**12 -> 1T.
+    """
+    for suffix, size in (("T", 10**12), ("B", 10**9), ("M", 10**6), ("K", 10**3)):
+        if n >= size and n % size == 0:
+            return f"{n // size}{suffix}"
+    return str(n)
+
 def draw_button(surface, rect, text, hover):
     bg_color = GOLD if hover else RED
     text_color = RED if hover else GOLD
     draw_rounded_rect(surface, rect, bg_color, 10)
-    txt = numgen_font.render(text, True, text_color)
+    txt = text_cache.render(numgen_font, text, True, text_color)
     surface.blit(txt, (rect.centerx - txt.get_width() // 2, rect.centery - txt.get_height() // 2))
 
-def run_slider_screen(surface):
-    knob_x = slider_x
-    dragging = False
+class SliderScene(Scene):
+    """
+    Picks the upper bound for the number generator; Generate replaces this
+    scene with the result.
+    """
+    fps = 60
     generate_button = pygame.Rect(SCREEN_WIDTH // 2 - 75, 220, 150, 40)
     back_button = pygame.Rect(SCREEN_WIDTH // 2 - 30, 5, 80, 20)
-    clock = pygame.time.Clock()
-    while True:
-        mouse_pos = pygame.mouse.get_pos()
-        generate_hover = generate_button.collidepoint(mouse_pos)
-        back_hover = back_button.collidepoint(mouse_pos)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = event.pos
-                if (knob_x - mx)**2 + (slider_y - my)**2 < (knob_radius * 2)**2:
-                    dragging = True
-                if generate_button.collidepoint(event.pos):
-                    return get_value(knob_x)
-                if back_button.collidepoint(event.pos):
-                    return "back_to_app"
-            elif event.type == pygame.MOUSEBUTTONUP:
-                dragging = False
-            elif event.type == pygame.MOUSEMOTION and dragging:
-                mx, _ = event.pos
-                knob_x = max(slider_x, min(slider_x + slider_width, mx))
+    count_button = pygame.Rect(SCREEN_WIDTH // 2 - 155, 266, 150, 36)
+    secure_button = pygame.Rect(SCREEN_WIDTH // 2 - 75, 174, 150, 36)
+    bulk_button = pygame.Rect(SCREEN_WIDTH // 2 + 5, 266, 150, 36)
+    # Band covering the slider track, knob and the "Max" label above it
+    slider_band = pygame.Rect(10, slider_y - 50, SCREEN_WIDTH - 20, 50 + knob_radius + 2)
+
+    def __init__(self):
+        self.knob_x = slider_x
+        self.dragging = False
+        self.generate_hover = self.back_hover = False
+        self.count_hover = self.bulk_hover = self.secure_hover = False
+        self.bulk_count = BULK_COUNTS[0]
+
+    def enter(self):
+        Scene.enter(self)
+        numgen_assets.load()
+
+    def handle_event(self, event):
+        global secure_random
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            mx, my = event.pos
+            if (self.knob_x - mx)**2 + (slider_y - my)**2 < (knob_radius * 2)**2:
+                self.dragging = True
+            if self.generate_button.collidepoint(event.pos):
+                scene_manager.replace(NumberScene(get_value(self.knob_x)))
+            elif self.count_button.collidepoint(event.pos):
+                self.bulk_count = BULK_COUNTS[(BULK_COUNTS.index(self.bulk_count) + 1) % len(BULK_COUNTS)]
+            elif self.bulk_button.collidepoint(event.pos):
+                scene_manager.push(BulkScene(get_value(self.knob_x), self.bulk_count))
+            elif self.secure_button.collidepoint(event.pos):
+                secure_random = not secure_random
+                state_store.set(SECURE_RANDOM_KEY, secure_random)
+            elif self.back_button.collidepoint(event.pos):
+                scene_manager.pop()
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            mx, _ = event.pos
+            self.knob_x = max(slider_x, min(slider_x + slider_width, mx))
+
+    def update(self, dt):
+        mouse_pos = touch_input.pos
+        self.generate_hover = self.generate_button.collidepoint(mouse_pos)
+        self.back_hover = self.back_button.collidepoint(mouse_pos)
+        self.count_hover = self.count_button.collidepoint(mouse_pos)
+        self.bulk_hover = self.bulk_button.collidepoint(mouse_pos)
+        self.secure_hover = self.secure_button.collidepoint(mouse_pos)
+
+    def render(self, surface):
+        knob_x = self.knob_x
+        state = (knob_x, self.generate_hover, self.back_hover,
+                 self.count_hover, self.bulk_hover, self.bulk_count, self.secure_hover, secure_random)
+        if state == self.last_state:
+            return
         surface.fill(BASE)
         inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
         draw_rounded_rect(surface, inner_rect, LIGHT_GRAY, 15)
         draw_slider(surface, knob_x)
         value = get_value(knob_x)
-        text = numgen_font.render(f"Max: {value}", True, WHITE)
+        text = text_cache.render(numgen_font, f"Max: {value}", True, WHITE)
         surface.blit(text, (knob_x - text.get_width() // 2, slider_y - 40))
-        draw_button(surface, generate_button, "Generate", generate_hover)
-        draw_button(surface, back_button, "Reset", back_hover)
-        pygame.display.flip()
-        clock.tick(60)
-
-def run_num_gen_screen(surface):
-    while True:
-        max_number = run_slider_screen(surface)
-        if max_number == "back_to_app":
-            return "back_to_app"
-        number = random.randint(1, max_number)
-        back_button = pygame.Rect(SCREEN_WIDTH // 2 - 40, 5, 80, 30)
-        clock = pygame.time.Clock()
-        while True:
-            mouse_pos = pygame.mouse.get_pos()
-            back_hover = back_button.collidepoint(mouse_pos)
+        draw_button(surface, self.generate_button, "Generate", self.generate_hover)
+        draw_button(surface, self.back_button, "Reset", self.back_hover)
+        draw_button(surface, self.count_button, f"Count {format_count(self.bulk_count)}", self.count_hover)
+        draw_button(surface, self.bulk_button, "Bulk", self.bulk_hover)
+        draw_button(surface, self.secure_button, "Secure on" if secure_random else "Secure off", self.secure_hover)
+        last_state = self.last_state
+        if last_state is None:
+            display.invalidate_all()
+        else:
+            if knob_x != last_state[0]:
+                display.invalidate(self.slider_band)
+            if self.generate_hover != last_state[1]:
+                display.invalidate(self.generate_button)
+            if self.back_hover != last_state[2]:
+                display.invalidate(self.back_button)
+            if self.count_hover != last_state[3] or self.bulk_count != last_state[5]:
+                display.invalidate(self.count_button)
+            if self.bulk_hover != last_state[4]:
+                display.invalidate(self.bulk_button)
+            if state[6:] != last_state[6:]:
+                display.invalidate(self.secure_button)
+        self.last_state = state
+
+    def next_change(self):
+        return float("inf")
+
+class NumberScene(Scene):
+    """
+    Shows a random number between 1 and max_number; Back returns to the menu.
+    """
+    fps = 60
+    events = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION)
+    back_button = pygame.Rect(SCREEN_WIDTH // 2 - 40, 5, 80, 30)
+
+    def __init__(self, max_number):
+        self.number = number_rng().randint(1, max_number)
+        self.back_hover = False
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.back_button.collidepoint(event.pos):
+                scene_manager.pop()
+
+    def update(self, dt):
+        self.back_hover = self.back_button.collidepoint(touch_input.pos)
+
+    def render(self, surface):
+        if self.back_hover == self.last_state:
+            return
+        surface.fill(BASE)
+        inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
+        draw_rounded_rect(surface, inner_rect, LIGHT_GRAY, 15)
+        text = text_cache.render(numgen_large_font, f"Number: {self.number}", True, GOLD)
+        surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2,
+                            SCREEN_HEIGHT // 2 - text.get_height() // 2))
+        draw_button(surface, self.back_button, "Back", self.back_hover)
+        if self.last_state is None:
+            display.invalidate_all()
+        else:
+            display.invalidate(self.back_button)
+        self.last_state = self.back_hover
+
+    def next_change(self):
+        return float("inf")
+
+class BulkScene(Scene):
+    """
+    Draws many numbers between 1 and max_number at once, a few chunks per
+    frame so the watch stays responsive, with a live histogram and summary
+    statistics. The values are saved to BULK_PATH; Back stops the draw.
+    """
+    events = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION)
+    back_button = pygame.Rect(SCREEN_WIDTH // 2 - 40, 5, 80, 30)
+    # Everything below the Back button, redrawn while values come in
+    panel = pygame.Rect(10, 40, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 50)
+    histogram_rect = pygame.Rect(30, 120, SCREEN_WIDTH - 60, 170)
+
+    def __init__(self, max_number, count):
+        self.draw = BulkDraw(max_number, count, rng=entropy_pool if secure_random else None)
+        self.back_hover = False
+
+    def enter(self):
+        Scene.enter(self)
+        numgen_assets.load()
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.back_button.collidepoint(event.pos):
+                self.draw.close()
+                scene_manager.pop()
+
+    def update(self, dt):
+        self.back_hover = self.back_button.collidepoint(touch_input.pos)
+        if not self.draw.done():
+            self.draw.run_for(BULK_FRAME_BUDGET)
+
+    def render(self, surface):
+        draw = self.draw
+        state = (draw.generated, self.back_hover)
+        if state == self.last_state:
+            return
+        if self.last_state is None:
             surface.fill(BASE)
-            inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
-            draw_rounded_rect(surface, inner_rect, LIGHT_GRAY, 15)
-            text = numgen_large_font.render(f"Number: {number}", True, GOLD)
-            surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2,
-                                SCREEN_HEIGHT // 2 - text.get_height() // 2))
-            draw_button(surface, back_button, "Back", back_hover)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if back_button.collidepoint(event.pos):
-                        return "back_to_slider"
-            pygame.display.flip()
-            clock.tick(60)
-
-def run_complex_app_screen(surface):
-    clock = pygame.time.Clock()
-    while True:
-        back_to_app = pony_menu()
-        return back_to_app
-    clock.tick(30)
-    return True
+            display.invalidate_all()
+        else:
+            display.invalidate(self.panel)
+            display.invalidate(self.back_button)
+        inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
+        draw_rounded_rect(surface, inner_rect, LIGHT_GRAY, 15)
+        draw_button(surface, self.back_button, "Back", self.back_hover)
+
+        mean, sd, low, high = draw.stats()
+        lines = (f"{draw.generated:,} of {draw.count:,} from 1-{draw.max_number} ({draw.backend})",
+                 f"mean {mean:.2f}   sd {sd:.2f}   min {low}   max {high}")
+        if draw.done():
+            lines += (f"Saved to {os.path.basename(draw.path)}",)
+        for i, line in enumerate(lines):
+            # The counts change every frame, so these are not worth caching
+            text = numgen_small_font.render(line, True, WHITE)
+            surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, 45 + i * 22))
+
+        bins = draw.histogram()
+        tallest = max(bins) or 1
+        area = self.histogram_rect
+        width = area.width / len(bins)
+        for i, n in enumerate(bins):
+            height = round(n * area.height / tallest)
+            if height:
+                x = area.x + round(i * width)
+                bar = pygame.Rect(x, area.bottom - height, max(1, area.x + round((i + 1) * width) - x - 1), height)
+                pygame.draw.rect(surface, GOLD, bar)
+        pygame.draw.line(surface, WHITE, area.bottomleft, area.bottomright)
+        self.last_state = state
+
+    def next_change(self):
+        return None if not self.draw.done() else float("inf")
+
+def wrap_words(font, words, width, max_lines, separator=" "):
+    """
+    Lays words out as lines of text no wider than width, up to max_lines.
+    Returns the lines and how many words they hold.
+    """
+    lines = []
+    line = ""
+    shown = 0
+    for word in words:
+        candidate = f"{line}{separator}{word}" if line else word
+        if line and font.size(candidate)[0] > width:
+            if len(lines) + 1 == max_lines:
+                break
+            lines.append(line)
+            candidate = word
+        line = candidate
+        shown += 1
+    if line:
+        lines.append(line)
+    return lines, shown
+
+# Choices offered by the raffle's range and count buttons
+RAFFLE_RANGES = (100, 1_000, 10**6, 10**9, 10**12)
+RAFFLE_COUNTS = (1, 3, 10, 100, 1_000, 10**6)
+
+class RaffleScene(Scene):
+    """
+    Draws k different numbers from 1..n, for lotteries and raffles, and lists
+    them in the order they were drawn. n goes up to a trillion; large draws
+    are spread over frames and saved to BULK_PATH.
+    """
+    events = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION)
+    back_button = pygame.Rect(SCREEN_WIDTH // 2 - 40, 5, 80, 30)
+    range_button = pygame.Rect(SCREEN_WIDTH // 2 - 215, 45, 210, 36)
+    count_button = pygame.Rect(SCREEN_WIDTH // 2 + 5, 45, 210, 36)
+    draw_button = pygame.Rect(SCREEN_WIDTH // 2 - 75, 266, 150, 36)
+    results_rect = pygame.Rect(25, 90, SCREEN_WIDTH - 50, 170)
+    panel = pygame.Rect(10, 40, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 50)
+
+    def __init__(self):
+        self.max_number = RAFFLE_RANGES[0]
+        self.count = RAFFLE_COUNTS[0]
+        self.draw = None
+        self.hover = None
+
+    def enter(self):
+        Scene.enter(self)
+        numgen_assets.load()
+
+    def buttons(self):
+        return (self.back_button, self.range_button, self.count_button, self.draw_button)
+
+    def counts(self):
+        # Only counts the range can hold, so a draw never picks fewer than it shows
+        return [k for k in RAFFLE_COUNTS if k <= self.max_number]
+
+    def handle_event(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        if self.back_button.collidepoint(event.pos):
+            if self.draw is not None:
+                self.draw.close()
+            scene_manager.pop()
+        elif self.range_button.collidepoint(event.pos):
+            self.max_number = RAFFLE_RANGES[(RAFFLE_RANGES.index(self.max_number) + 1) % len(RAFFLE_RANGES)]
+            # A smaller range brings the count down to the largest one it still holds
+            self.count = max(k for k in self.counts() if k <= self.count)
+        elif self.count_button.collidepoint(event.pos):
+            counts = self.counts()
+            self.count = counts[(counts.index(self.count) + 1) % len(counts)]
+        elif self.draw_button.collidepoint(event.pos):
+            if self.draw is not None:
+                self.draw.close()
+            self.draw = UniqueDraw(self.max_number, self.count, rng=number_rng())
+
+    def update(self, dt):
+        self.hover = next((rect for rect in self.buttons() if rect.collidepoint(touch_input.pos)), None)
+        if self.draw is not None and not self.draw.done():
+            self.draw.run_for(BULK_FRAME_BUDGET)
+
+    def render(self, surface):
+        draw = self.draw
+        state = (self.max_number, self.count, self.hover, id(draw), draw and draw.generated)
+        if state == self.last_state:
+            return
+        surface.fill(BASE)
+        inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
+        draw_rounded_rect(surface, inner_rect, LIGHT_GRAY, 15)
+        draw_button(surface, self.back_button, "Back", self.hover == self.back_button)
+        draw_button(surface, self.range_button, f"From 1-{format_count(self.max_number)}",
+                    self.hover == self.range_button)
+        draw_button(surface, self.count_button, f"Pick {format_count(self.count)}",
+                    self.hover == self.count_button)
+        draw_button(surface, self.draw_button, "Draw", self.hover == self.draw_button)
+
+        if draw is not None:
+            area = self.results_rect
+            lines, shown = wrap_words(numgen_small_font, (f"{v:,}" for v in draw.first),
+                                      area.width, 5, "   ")
+            for i, line in enumerate(lines):
+                text = numgen_small_font.render(line, True, WHITE)
+                surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, area.y + i * 26))
+            if draw.count > shown:
+                status = f"{draw.generated:,} of {draw.count:,} drawn"
+                if draw.done():
+                    status += f", saved to {os.path.basename(draw.path)}"
+                text = numgen_small_font.render(status, True, GOLD)
+                surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, area.bottom - 26))
+        if self.last_state is None:
+            display.invalidate_all()
+        else:
+            display.invalidate(self.panel)
+            display.invalidate(self.back_button)
+        self.last_state = state
+
+    def next_change(self):
+        if self.draw is not None and not self.draw.done():
+            return None
+        return float("inf")
+
+# ----------------------
+# Name Picker App
+# ----------------------
+# The default list is the class roster in the README
+ROSTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "README.md")
+ROSTER_HEADING = "## XI Class Roster"
+# Smallest number of entries per alias block; see WeightedPicker
+PICKER_MIN_BLOCK = 16
+PICKER_MAX_WEIGHT = 5
+
+def load_roster(path=ROSTER_PATH, heading=ROSTER_HEADING):
+    """
+    Returns the "- name" entries listed under heading in a markdown file.
+    """
+    names = []
+    try:
+        with open(path, "r") as f:
+            lines = iter(f.read().splitlines())
+    except OSError as e:
+        print(f"Could not read roster from {path}: {e}")
+        return names
+    for line in lines:
+        if line.strip() == heading:
+            break
+    for line in lines:
+        line = line.strip()
+        if line.startswith("#") or line == "---":
+            break
+        if line.startswith("- "):
+            names.append(line[2:].strip())
+    return names
+
+class AliasTable:
+    """
+    Vose's alias method over a list of non-negative weights: built in O(n),
+    then each sample is one random number and one table lookup. total is the
+    sum of the weights; a table with total 0 must not be sampled.
+    """
+    def __init__(self, weights):
+        n = len(weights)
+        self.total = total = float(sum(weights))
+        self.prob = prob = [1.0] * n
+        self.alias = alias = list(range(n))
+        if total <= 0:
+            return
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large[-1]
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(large.pop())
+        # Whatever is left is 1 up to rounding error
+        for i in small + large:
+            prob[i] = 1.0
+
+    def sample(self, rng=random):
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+class WeightedPicker:
+    """
+    Picks entries with probability proportional to their weights, with or
+    without replacement. Entries are split into blocks of block_size, each
+    with its own alias table, and a second alias table picks the block by its
+    total weight, so a pick is O(1) and changing one weight rebuilds only its
+    block and the table over blocks, O(block_size + n / block_size); the
+    default block size of about sqrt(n) makes that O(sqrt(n)).
+    Picking without replacement sets the entry's weight to 0 until reset().
+    """
+    def __init__(self, names, weights=None, rng=random, block_size=None):
+        self.names = list(names)
+        self.weights = [1.0] * len(self.names) if weights is None else [float(w) for w in weights]
+        if len(self.weights) != len(self.names):
+            raise ValueError("need one weight per name")
+        if any(w < 0 for w in self.weights):
+            raise ValueError("weights must not be negative")
+        self.rng = rng
+        self.block_size = block_size or max(PICKER_MIN_BLOCK, math.isqrt(len(self.names)))
+        self.removed = {}
+        self.changes = 0
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Builds every block's table and the table over blocks from scratch.
+        """
+        self.changes += 1
+        size = self.block_size
+        self.blocks = [AliasTable(self.weights[start:start + size])
+                       for start in range(0, len(self.weights), size)]
+        self.top = AliasTable([block.total for block in self.blocks])
+
+    def total(self):
+        return self.top.total
+
+    def set_weight(self, index, weight):
+        if weight < 0:
+            raise ValueError("weights must not be negative")
+        self.removed.pop(index, None)
+        self.changes += 1
+        self.weights[index] = float(weight)
+        b = index // self.block_size
+        start = b * self.block_size
+        self.blocks[b] = AliasTable(self.weights[start:start + self.block_size])
+        self.top = AliasTable([block.total for block in self.blocks])
+
+    def pick(self):
+        """
+        Returns the index of a weighted random entry, leaving it in the list.
+        """
+        if self.top.total <= 0:
+            raise ValueError("nothing left to pick")
+        b = self.top.sample(self.rng)
+        return b * self.block_size + self.blocks[b].sample(self.rng)
+
+    def pick_unique(self):
+        """
+        Returns the index of a weighted random entry and takes it out of the
+        draw until reset().
+        """
+        index = self.pick()
+        weight = self.weights[index]
+        self.set_weight(index, 0)
+        self.removed[index] = weight
+        return index
+
+    def reset(self):
+        """
+        Puts back every entry taken by pick_unique().
+        """
+        for index, weight in self.removed.items():
+            self.weights[index] = weight
+        self.removed = {}
+        self.rebuild()
+
+roster_names = []
+picker_font = None
+
+def load_picker_assets():
+    global roster_names, picker_font
+    picker_font = get_font(None, 28)
+    roster_names = load_roster()
+
+picker_assets = AppAssets(load_picker_assets)
+
+class PickerScene(Scene):
+    """
+    Picks a name from a weighted list, the class roster by default. Tapping a
+    name in the list cycles its weight from 0 to PICKER_MAX_WEIGHT; with
+    repeats off, a picked name sits out (weight 0) until Reset.
+    """
+    back_button = pygame.Rect(SCREEN_WIDTH // 2 - 40, 5, 80, 30)
+    list_area = pygame.Rect(20, 40, 250, 260)
+    pick_button = pygame.Rect(290, 160, 170, 40)
+    repeat_button = pygame.Rect(290, 210, 170, 36)
+    reset_button = pygame.Rect(290, 256, 170, 36)
+    result_rect = pygame.Rect(285, 40, 180, 110)
+
+    def __init__(self, names=None, weights=None):
+        self.names = names
+        self.weights = weights
+        self.picker = None
+        self.repeats = True
+        self.picked = None
+        self.message = "Tap Pick"
+        self.scroll = 0
+        self.min_scroll = 0
+        self.dragging = False
+        self.hover = None
+
+    def enter(self):
+        Scene.enter(self)
+        numgen_assets.load()
+        picker_assets.load()
+        if self.picker is None:
+            self.picker = WeightedPicker(roster_names if self.names is None else self.names, self.weights,
+                                         rng=number_rng())
+            pitch = 42
+            self.list = VirtualList(self.list_area, len(self.picker.names), pitch - 6, 6, 0,
+                                    self.render_row, LIGHT_GRAY)
+            self.min_scroll = min(0, self.list_area.height - len(self.picker.names) * pitch + 6)
+        self.dragging = False
+
+    def render_row(self, index, state):
+        weight, highlighted = state
+        row = pygame.Surface((self.list_area.width, self.list.row_height)).convert()
+        row.fill(LIGHT_GRAY)
+        draw_rounded_rect(row, row.get_rect(), GOLD if highlighted else RED, 8)
+        color = RED if highlighted else (GOLD if weight else LIGHT_GRAY)
+        name = text_cache.render(picker_font, self.picker.names[index], True, color)
+        row.blit(name, (10, row.get_height() // 2 - name.get_height() // 2))
+        label = text_cache.render(picker_font, f"x{weight:g}", True, color)
+        row.blit(label, (row.get_width() - label.get_width() - 10, row.get_height() // 2 - label.get_height() // 2))
+        return row
+
+    def buttons(self):
+        return (self.back_button, self.pick_button, self.repeat_button, self.reset_button)
+
+    def pick(self):
+        try:
+            index = self.picker.pick() if self.repeats else self.picker.pick_unique()
+        except ValueError:
+            self.picked = None
+            self.message = "No one left"
+            return
+        self.picked = index
+        self.message = self.picker.names[index]
+
+    def handle_event(self, event):
+        picker = self.picker
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.list_area.collidepoint(event.pos):
+                self.dragging = True
+                self.drag_distance = 0
+            elif self.back_button.collidepoint(event.pos):
+                scene_manager.pop()
+            elif self.pick_button.collidepoint(event.pos):
+                self.pick()
+            elif self.repeat_button.collidepoint(event.pos):
+                self.repeats = not self.repeats
+            elif self.reset_button.collidepoint(event.pos):
+                picker.reset()
+                self.picked = None
+                self.message = "Tap Pick"
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            self.drag_distance += abs(event.rel[1])
+            self.scroll = max(self.min_scroll, min(self.scroll + event.rel[1], 0))
+        elif event.type == pygame.MOUSEBUTTONUP and self.dragging:
+            self.dragging = False
+            # A tap, not the end of a scroll, changes the weight
+            index = self.list.index_at(event.pos, self.scroll)
+            if index is not None and self.drag_distance < 10:
+                picker.set_weight(index, (picker.weights[index] + 1) % (PICKER_MAX_WEIGHT + 1))
+
+    def update(self, dt):
+        self.hover = next((rect for rect in self.buttons() if rect.collidepoint(touch_input.pos)), None)
+
+    def render(self, surface):
+        picker = self.picker
+        state = (self.scroll, self.hover, self.repeats, self.message, self.picked, picker.changes)
+        if state == self.last_state:
+            return
+        surface.fill(BASE)
+        inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
+        draw_rounded_rect(surface, inner_rect, LIGHT_GRAY, 15)
+        self.list.draw(surface, self.scroll, lambda i: (picker.weights[i], i == self.picked))
+        draw_button(surface, self.back_button, "Back", self.hover == self.back_button)
+        draw_button(surface, self.pick_button, "Pick", self.hover == self.pick_button)
+        draw_button(surface, self.repeat_button, "Repeats on" if self.repeats else "Repeats off",
+                    self.hover == self.repeat_button)
+        draw_button(surface, self.reset_button, "Reset", self.hover == self.reset_button)
+        lines, _ = wrap_words(numgen_font, self.message.split(), self.result_rect.width, 3)
+        for i, line in enumerate(lines):
+            text = text_cache.render(numgen_font, line, True, GOLD)
+            surface.blit(text, (self.result_rect.centerx - text.get_width() // 2, self.result_rect.y + 10 + i * 32))
+        display.invalidate_all()
+        self.last_state = state
+
+    def next_change(self):
+        return float("inf")
 
 # ----------------------
 # Timer & Stopwatch App (Integrated from timer.py)
@@ -304,8 +2047,7 @@ class Button:
         self.image = image
 
     def draw(self):
-        mouse_pos = pygame.mouse.get_pos()
-        is_hovered = self.rect.collidepoint(mouse_pos)
+        is_hovered = self.rect.collidepoint(touch_input.pos)
         bg_color = GOLD if is_hovered else RED
         text_color = RED if is_hovered else GOLD
         pygame.draw.rect(screen, bg_color, self.rect, border_radius=8)
@@ -313,169 +2055,242 @@ class Button:
             image_rect = self.image.get_rect(center=self.rect.center)
             screen.blit(self.image, image_rect)
         else:
-            text_surface = pygame.font.SysFont(None, 32).render(self.text, True, text_color)
+            text_surface = text_cache.render(get_font(None, 32), self.text, True, text_color)
             text_rect = text_surface.get_rect(center=self.rect.center)
             screen.blit(text_surface, text_rect)
 
     def is_pressed(self, pos):
         return self.rect.collidepoint(pos)
 
+home_icon = None
+
+def load_timer_assets():
+    global home_icon
+    get_font(None, 32)
+    get_font(None, 72)
+    try:
+        home_icon = pygame.image.load("home_icon.png")
+        home_icon = pygame.transform.scale(home_icon, (24, 24))
+    except Exception as e:
+        print("home_icon.png not found; using text for Home button.")
+        home_icon = None
+
+timer_assets = AppAssets(load_timer_assets)
+
 def format_time(seconds):
     hours = int(seconds // 3600)
     minutes = int((seconds % 3600) // 60)
     secs = int(seconds % 60)
     return f"{hours:02}:{minutes:02}:{secs:02}"
 
-def run_timer_app():
-    mode = None
-    running = False
-    start_time = 0
-    elapsed = 0
-    timer_seconds = 0
-    timer_display_value = 0
+NS_PER_SECOND = 1_000_000_000
 
+class TimerEngine:
+    """
+    Timer and stopwatch state, kept apart from the UI. Time is read from an
+    integer nanosecond monotonic clock (injectable for tests), so adjusting
+    the system clock cannot move it and long runs do not pick up float
+    rounding. The display shows whole seconds, and next_change() says exactly
+    when that number will next change.
+    """
+    def __init__(self, clock=time.monotonic_ns):
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.mode = None
+        self.running = False
+        self.started_ns = 0
+        self.accumulated_ns = 0  # elapsed before the current run
+        self.duration_ns = 0     # countdown length in Timer mode
+
+    def select(self, mode):
+        self.mode = mode
+        self.running = False
+        self.accumulated_ns = 0
+
+    def start(self):
+        if self.running:
+            return
+        if self.mode == "Timer":
+            self.accumulated_ns = 0  # a countdown always restarts from its full length
+        self.started_ns = self.clock()
+        self.running = True
+
+    def stop(self):
+        if self.running:
+            self.accumulated_ns += self.clock() - self.started_ns
+            self.running = False
+
+    def adjust(self, seconds):
+        """
+        Adds seconds (negative to subtract) to the countdown length, clamped at zero.
+        """
+        self.duration_ns = max(0, self.duration_ns + seconds * NS_PER_SECOND)
+        self.accumulated_ns = 0
+
+    def elapsed_ns(self, now=None):
+        if not self.running:
+            return self.accumulated_ns
+        return self.accumulated_ns + (self.clock() if now is None else now) - self.started_ns
+
+    def remaining_ns(self, now=None):
+        return max(0, self.duration_ns - self.elapsed_ns(now))
+
+    def display_seconds(self, now=None):
+        """
+        The whole seconds on the readout: counted up for the stopwatch, down
+        for the timer.
+        """
+        if self.mode == "Stopwatch":
+            return self.elapsed_ns(now) // NS_PER_SECOND
+        return self.remaining_ns(now) // NS_PER_SECOND
+
+    def next_change_ns(self, now=None):
+        """
+        Nanoseconds until display_seconds() changes, or None if it will not
+        change on its own (stopped, or a countdown already at zero).
+        """
+        if not self.running:
+            return None
+        if self.mode == "Stopwatch":
+            return NS_PER_SECOND - self.elapsed_ns(now) % NS_PER_SECOND
+        remaining = self.remaining_ns(now)
+        if remaining < NS_PER_SECOND:
+            return None  # already showing zero
+        # The readout floors, so it changes as soon as remaining drops below the whole second
+        return remaining % NS_PER_SECOND + 1
+
+    def next_change(self):
+        wait = self.next_change_ns()
+        return float("inf") if wait is None else wait / NS_PER_SECOND
+
+class TimerScene(Scene):
+    """
+    Countdown timer and stopwatch, drawn from a TimerEngine.
+    """
+    events = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION)
     default_timer_display_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, 20, 200, 35)
     center_timer_display_rect = pygame.Rect(SCREEN_WIDTH // 2 - 190, SCREEN_HEIGHT // 2 - 60, 380, 120)
-    timer_display_rect = default_timer_display_rect
-
-    timer_btn = Button((SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 60, 200, 50), "Timer")
-    sw_btn = Button((SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 10, 200, 50), "Stopwatch")
 
-    start_btn = Button((40, 260, 120, 40), "Start")
-    stop_btn = Button((180, 260, 120, 40), "Stop")
-    reset_btn = Button((320, 260, 120, 40), "Restart")
-
-    try:
-        home_icon = pygame.image.load("home_icon.png")
-        home_icon = pygame.transform.scale(home_icon, (24, 24))
-    except Exception as e:
-        print("home_icon.png not found; using text for Home button.")
-        home_icon = None
-    nav_btn_width = 80
-    nav_btn = Button(((SCREEN_WIDTH - nav_btn_width) // 2, 5, nav_btn_width, 30), "Back", image=home_icon)
-
-    x_center = SCREEN_WIDTH // 2
-    y_start = 70
-    column_width = 100
-    row_height = 45
-
-    time_labels = [
-        ("+5h", "+5m", "+5s"),
-        ("+1h", "+1m", "+1s"),
-        ("-1h", "-1m", "-1s"),
-        ("-5h", "-5m", "-5s")
-    ]
-
-    time_buttons = []
-    for row_idx, row in enumerate(time_labels):
-        for col_idx, label in enumerate(row):
-            x = x_center + (col_idx - 1) * column_width - 35
-            y = y_start + row_idx * row_height
-            time_buttons.append(Button((x, y, 70, 40), label))
-
-    clock = pygame.time.Clock()
-    while True:
-        screen.fill(LIGHT_GRAY)
+    def __init__(self, engine=None):
+        self.engine = engine if engine is not None else TimerEngine()
+        self.timer_display_rect = self.default_timer_display_rect
+        self.hovered = None
+        self.display_value = 0
+
+        self.timer_btn = Button((SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 60, 200, 50), "Timer")
+        self.sw_btn = Button((SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 10, 200, 50), "Stopwatch")
+
+        self.start_btn = Button((40, 260, 120, 40), "Start")
+        self.stop_btn = Button((180, 260, 120, 40), "Stop")
+        self.reset_btn = Button((320, 260, 120, 40), "Restart")
+
+        timer_assets.load()
+        nav_btn_width = 80
+        self.nav_btn = Button(((SCREEN_WIDTH - nav_btn_width) // 2, 5, nav_btn_width, 30), "Back", image=home_icon)
+
+        x_center = SCREEN_WIDTH // 2
+        y_start = 70
+        column_width = 100
+        row_height = 45
+
+        time_labels = [
+            ("+5h", "+5m", "+5s"),
+            ("+1h", "+1m", "+1s"),
+            ("-1h", "-1m", "-1s"),
+            ("-5h", "-5m", "-5s")
+        ]
+
+        self.time_buttons = []
+        for row_idx, row in enumerate(time_labels):
+            for col_idx, label in enumerate(row):
+                x = x_center + (col_idx - 1) * column_width - 35
+                y = y_start + row_idx * row_height
+                self.time_buttons.append(Button((x, y, 70, 40), label))
+
+        self.all_buttons = [self.timer_btn, self.sw_btn, self.start_btn, self.stop_btn,
+                            self.reset_btn, self.nav_btn] + self.time_buttons
+
+    def handle_event(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        pos = event.pos
+        engine = self.engine
+        if self.nav_btn.is_pressed(pos):
+            # Exit timer app and return to main app
+            scene_manager.pop()
+        elif engine.mode is None:
+            if self.timer_btn.is_pressed(pos):
+                engine.select("Timer")
+                self.timer_display_rect = self.default_timer_display_rect
+            elif self.sw_btn.is_pressed(pos):
+                engine.select("Stopwatch")
+        else:
+            if self.reset_btn.is_pressed(pos):
+                engine.reset()
+                self.timer_display_rect = self.default_timer_display_rect
+            elif self.start_btn.is_pressed(pos):
+                if not engine.running:
+                    engine.start()
+                    if engine.mode == "Timer":
+                        self.timer_display_rect = self.center_timer_display_rect
+            elif self.stop_btn.is_pressed(pos):
+                if engine.running:
+                    engine.stop()
+                    if engine.mode == "Timer":
+                        self.timer_display_rect = self.default_timer_display_rect
+            if engine.mode == "Timer" and not engine.running:
+                for b in self.time_buttons:
+                    if b.is_pressed(pos):
+                        label = b.text
+                        val = int(label[1:-1])
+                        unit = {"h": 3600, "m": 60, "s": 1}[label[-1]]
+                        engine.adjust(val * unit if label.startswith("+") else -val * unit)
+
+    def update(self, dt):
+        self.display_value = self.engine.display_seconds() if self.engine.mode is not None else None
+        mouse_pos = touch_input.pos
+        self.hovered = next((b for b in self.all_buttons if b.rect.collidepoint(mouse_pos)), None)
+
+    def render(self, surface):
+        # The readout only changes once a second; skip frames where nothing moved
+        mode, running = self.engine.mode, self.engine.running
+        layout = (mode, running, self.timer_display_rect, self.hovered)
+        if (layout, self.display_value) == self.last_state:
+            return
+        surface.fill(LIGHT_GRAY)
         layer_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
-        pygame.draw.rect(screen, LIGHT_GRAY, layer_rect, border_radius=15)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                pos = event.pos
-                if nav_btn.is_pressed(pos):
-                    # Exit timer app and return to main app
-                    return "back_to_app"
-                else:
-                    if mode is None:
-                        if timer_btn.is_pressed(pos):
-                            mode = "Timer"
-                            timer_display_value = timer_seconds
-                            timer_display_rect = default_timer_display_rect
-                        elif sw_btn.is_pressed(pos):
-                            mode = "Stopwatch"
-                            elapsed = 0
-                            timer_display_value = 0
-                            running = False
-                    else:
-                        if reset_btn.is_pressed(pos):
-                            running = False
-                            elapsed = 0
-                            timer_seconds = 0
-                            timer_display_value = 0
-                            timer_display_rect = default_timer_display_rect
-                            mode = None
-                        elif start_btn.is_pressed(pos):
-                            if not running:
-                                start_time = time.time()
-                                running = True
-                                if mode == "Stopwatch":
-                                    start_time -= elapsed
-                                elif mode == "Timer":
-                                    elapsed = 0
-                                    timer_display_rect = center_timer_display_rect
-                        elif stop_btn.is_pressed(pos):
-                            if running:
-                                elapsed = time.time() - start_time
-                                running = False
-                                if mode == "Timer":
-                                    timer_display_value = max(0, timer_seconds - elapsed)
-                                    timer_display_rect = default_timer_display_rect
-                                elif mode == "Stopwatch":
-                                    timer_display_value = elapsed
-                        if mode == "Timer" and not running:
-                            for b in time_buttons:
-                                if b.is_pressed(pos):
-                                    label = b.text
-                                    val = int(label[1:-1])
-                                    if label.startswith("+"):
-                                        if "h" in label:
-                                            timer_seconds += val * 3600
-                                        elif "m" in label:
-                                            timer_seconds += val * 60
-                                        elif "s" in label:
-                                            timer_seconds += val
-                                    elif label.startswith("-"):
-                                        if "h" in label:
-                                            timer_seconds = max(0, timer_seconds - val * 3600)
-                                        elif "m" in label:
-                                            timer_seconds = max(0, timer_seconds - val * 60)
-                                        elif "s" in label:
-                                            timer_seconds = max(0, timer_seconds - val)
-                                    timer_display_value = timer_seconds
-        if mode == "Timer":
-            if running:
-                elapsed = time.time() - start_time
-                timer_display_value = max(0, timer_seconds - elapsed)
-        elif mode == "Stopwatch":
-            if running:
-                timer_display_value = time.time() - start_time
-
+        pygame.draw.rect(surface, LIGHT_GRAY, layer_rect, border_radius=15)
         if mode is not None:
             if mode == "Stopwatch":
-                display_rect = center_timer_display_rect
-                font_to_use = pygame.font.SysFont(None, 72)
+                display_rect = self.center_timer_display_rect
+                font_to_use = get_font(None, 72)
             else:
-                display_rect = timer_display_rect
-                font_to_use = pygame.font.SysFont(None, 32) if not running else pygame.font.SysFont(None, 72)
-            pygame.draw.rect(screen, RED, display_rect, border_radius=12)
-            time_surface = font_to_use.render(format_time(timer_display_value), True, GOLD)
+                display_rect = self.timer_display_rect
+                font_to_use = get_font(None, 32) if not running else get_font(None, 72)
+            pygame.draw.rect(surface, RED, display_rect, border_radius=12)
+            time_surface = text_cache.render(font_to_use, format_time(self.display_value), True, GOLD)
             time_rect = time_surface.get_rect(center=display_rect.center)
-            screen.blit(time_surface, time_rect)
-            start_btn.draw()
-            stop_btn.draw()
-            reset_btn.draw()
+            surface.blit(time_surface, time_rect)
+            self.start_btn.draw()
+            self.stop_btn.draw()
+            self.reset_btn.draw()
             if mode == "Timer" and not running:
-                for b in time_buttons:
+                for b in self.time_buttons:
                     b.draw()
         else:
-            timer_btn.draw()
-            sw_btn.draw()
-            nav_btn.draw()
-        pygame.display.flip()
-        clock.tick(30)
+            self.timer_btn.draw()
+            self.sw_btn.draw()
+            self.nav_btn.draw()
+        if self.last_state is not None and layout == self.last_state[0]:
+            display.invalidate(display_rect)
+        else:
+            display.invalidate_all()
+        self.last_state = (layout, self.display_value)
+
+    def next_change(self):
+        return self.engine.next_change()
 
 
 # ----------------------
@@ -484,70 +2299,77 @@ def run_timer_app():
 
 # Game Definitions
 
-clock = pygame.time.Clock()
-
-# High score - THIS VALUE WILL BE MODIFIED BY THE GAME ITSELF
-# Do not change this value manually
-SAVED_HIGH_SCORE = 11
-
-# Image Assets
-pony_images = [pygame.image.load("assets/pony_up.png"), pygame.image.load("assets/pony_mid.png"), pygame.image.load("assets/pony_down.png")]
-skyline_image = pygame.image.load("assets/background.png")
-ground_image = pygame.image.load("assets/ground.png")
-top_fence_image = pygame.image.load("assets/fence_top.png")
-bottom_fence_image = pygame.image.load("assets/fence_bottom.png")
-game_over_image = pygame.image.load("assets/game_over.png")
-start_image = pygame.image.load("assets/start.png")
+# High score saved in main.py before it moved to the state store; used until a
+# game sets a new one
+LEGACY_HIGH_SCORE = 11
+
+# Image and font assets, loaded on first entry by load_pony_assets()
+pony_images = None
+skyline_image = ground_image = None
+top_fence_image = bottom_fence_image = None
+game_over_image = start_image = None
+score_font = small_font = back_font = None
+pony_background_layers = pony_foreground_layers = None
+
+# Parallax speed of each layer relative to the ground. background.png does not
+# tile seamlessly, so the skyline stays still.
+SKYLINE_SCROLL_SPEED = 0
+GROUND_SCROLL_SPEED = 1
+
+pony_image_paths = ["assets/pony_up.png", "assets/pony_mid.png", "assets/pony_down.png"]
+
+def load_pony_assets():
+    global pony_images, skyline_image, ground_image, top_fence_image, bottom_fence_image
+    global game_over_image, start_image, score_font, small_font, back_font
+    global pony_background_layers, pony_foreground_layers
+    pony_images = [assets.image(path) for path in pony_image_paths]
+    skyline_image = assets.image("assets/background.png")
+    ground_image = assets.image("assets/ground.png")
+    top_fence_image = assets.image("assets/fence_top.png")
+    bottom_fence_image = assets.image("assets/fence_bottom.png")
+    game_over_image = assets.image("assets/game_over.png")
+    start_image = assets.image("assets/start.png")
+    score_font = get_font("assets/PressStart2P-Regular.ttf", 14, system=False)
+    small_font = get_font("assets/PressStart2P-Regular.ttf", 10, system=False)  # Smaller font for game over screen
+    back_font = get_font("assets/PressStart2P-Regular.ttf", 14)
+    pony_background_layers = [ScrollingLayer(skyline_image, 0, SKYLINE_SCROLL_SPEED)]
+    pony_foreground_layers = [ScrollingLayer(ground_image, ground_y, GROUND_SCROLL_SPEED)]
+
+pony_assets = AppAssets(load_pony_assets)
 
 # Game
-scroll_speed = 5
+# The simulation advances in fixed ticks of 1/SIM_HZ seconds no matter how fast
+# frames are drawn, so every per-tick speed below is frame-rate independent.
+SIM_HZ = 30
+RENDER_FPS = 60
+GAME_OVER_INPUT_DELAY_TICKS = SIM_HZ  # One second before a tap restarts
+scroll_speed = 5  # px per tick
 pony_start_position = (100, 160)
-score = 0
-high_score = SAVED_HIGH_SCORE
-score_font = pygame.font.Font("assets/PressStart2P-Regular.ttf", 14)
-small_font = pygame.font.Font("assets/PressStart2P-Regular.ttf", 10)  # Smaller font for game over screen
+ground_y = 300
+high_score = LEGACY_HIGH_SCORE
 game_stopped = True
 
-# Function to update high score in this file
-def update_high_score_in_file(new_high_score):
-    """Update the high score directly in the script file"""
-    try:
-        # Get the full path to the current script
-        script_path = os.path.abspath(__file__)
-        
-        # Read the entire file content
-        with open(script_path, 'r') as f:
-            content = f.read()
-        
-        # Use regex to find and replace the SAVED_HIGH_SCORE value
-        new_content = re.sub(r'SAVED_HIGH_SCORE = \d+', f'SAVED_HIGH_SCORE = {new_high_score}', content)
-        
-        # Write the updated content back to the file
-        with open(script_path, 'w') as f:
-            f.write(new_content)
-            
-        return True
-    except Exception as e:
-        print(f"Failed to update high score: {e}")
-        return False
+# ----------------------
+# Golden Pony Simulation
+# ----------------------
+# The rules below use only pygame.Rect, so they run without a display, input
+# polling or a frame limiter. Sizes come from the images but are passed in.
 
-class Pony(pygame.sprite.Sprite):
-    def __init__(self):
-        pygame.sprite.Sprite.__init__(self)
-        self.image = pony_images[0]
-        self.rect = self.image.get_rect()
+class Pony:
+    def __init__(self, size):
+        self.rect = pygame.Rect((0, 0), size)
         self.rect.center = pony_start_position
+        self.prev_y = self.rect.y
         self.image_index = 0
         self.vel = 0
         self.flap = False
         self.alive = True
-    
-    def update(self):
+
+    def update(self, flap_pressed):
         # Pony Animation
         self.image_index += 1
         if self.image_index >= 30:
             self.image_index = 0
-        self.image = pony_images[self.image_index // 10]
 
         # Gravity and Flap
         self.vel += 0.5
@@ -558,303 +2380,682 @@ class Pony(pygame.sprite.Sprite):
         if self.vel == 0:
             self.flap = False
 
-        # User Input TouchScreen
-        if pygame.mouse.get_pressed()[0] and not self.flap and self.rect.y > 0 and self.alive:
-            self.flap = True
-            self.vel = -7
-            
-         # User Input with buttons
-        if pygame.key.get_pressed()[pygame.K_SPACE] and not self.flap and self.rect.y > 0 and self.alive:
+        # User Input (touchscreen or space bar)
+        if flap_pressed and not self.flap and self.rect.y > 0 and self.alive:
             self.flap = True
             self.vel = -7
-            
-            
-class Fence(pygame.sprite.Sprite):
-    def __init__(self, x, y, image, fence_type): # takes coordinates of fence, image
-        pygame.sprite.Sprite.__init__(self) #initialize parent class
-        self.image = image # = to image we are passing in agrs
-        # conveinent for checking for collisions 
-        self.rect = self.image.get_rect() # manipulate position of img
-        self.rect.x, self.rect.y = x, y # set xy coords of img = to the xy coords we pass in agrs
-        self.enter, self.exit, self.passed = False, False, False
+
+class Fence:
+    def __init__(self, x=0, y=0, size=(0, 0), fence_type='top'): # takes coordinates and size of the fence
+        self.rect = pygame.Rect((x, y), size)
+        self.place(x, y, size, fence_type)
+
+    def place(self, x, y, size, fence_type):
+        """
+        Puts a pooled fence back into play without allocating a new Rect.
+        """
+        self.rect.update(x, y, size[0], size[1])
+        self.prev_x = x
+        self.passed = False
         self.fence_type = fence_type
+        self.partner = None  # the bottom fence of a top fence's pair
 
-    def update(self): # responsible for moving fences from left to right side of screen
+    def update(self):
         # move fences
         self.rect.x -= scroll_speed
-        if self.rect.x <= -SCREEN_WIDTH:
-            self.kill()
-
-        global score 
-        if self.fence_type == "bottom":
-            if pony_start_position[0] > self.rect.topleft[0] and not self.passed:
-                self.enter = True 
-            if pony_start_position[0] > self.rect.topright[0] and not self.passed:
-                self.exit = True
-            if self.enter and self.exit and not self.passed:
-                self.passed = True
-                score += 1
-
-class Ground(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        pygame.sprite.Sprite.__init__(self)
-        self.image = ground_image
-        self.rect = self.image.get_rect()
-        self.rect.x, self.rect.y = x, y
 
-    def update(self):
-        # Moving ground
-        self.rect.x -= scroll_speed
-        if self.rect.x <= -SCREEN_WIDTH:
-            self.kill()
-
-# Exiting game
-def quit_pony():
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            exit()
-
-# Game Main Method
-def golden_pony():
-    global score, high_score
-
-    # Load the saved high score at the start of each game
-    high_score = SAVED_HIGH_SCORE
-
-    # Instantiate Initial Ground
-    x_pos_ground, y_pos_ground = 0, 300
-    ground = pygame.sprite.Group()
-    ground.add(Ground(x_pos_ground, y_pos_ground))
-    
-    # Fences Setup
-    fence_timer = 0
-    fences = pygame.sprite.Group()
-    
-    # Instantiate Pony
-    pony = pygame.sprite.GroupSingle()
-    pony.add(Pony())
-
-    # Game over state
-    game_over = False
-    wait_time = 0  # Add a small delay before accepting input after game over
-
-    run = True
-    while run:
-        # Quit game
-        quit_pony()
-
-        # Reset Frame
-        screen.fill(BLACK)
-
-        # User Input 
-        user_input = pygame.mouse.get_pressed()
-
-        # Draw Background
-        screen.blit(skyline_image, (0, 0))
-
-        # Spawn Ground
-        if len(ground) <= 2:
-            ground.add(Ground(SCREEN_WIDTH, y_pos_ground))
-            
-        # Draw - Fences, Ground, and Pony
-        fences.draw(screen)
-        ground.draw(screen)
-        pony.draw(screen)
+class EntityPool:
+    """
+    Preallocated entities (fences) that are recycled in place. acquire()
+    only creates a new entity when every preallocated one is in play, and
+    counts it in allocations, so a steady run should keep that at zero.
+    """
+    def __init__(self, factory, size):
+        self.factory = factory
+        self.free = [factory() for _ in range(size)]
+        self.preallocated = size
+        self.allocations = 0
+        self.acquired = 0
+        self.released = 0
+
+    def acquire(self, *args):
+        if self.free:
+            entity = self.free.pop()
+        else:
+            entity = self.factory()
+            self.allocations += 1
+        entity.place(*args)
+        self.acquired += 1
+        return entity
 
-        # Show Score
-        score_text = score_font.render ('Score: ' + str(score), True, pygame.Color(255, 255, 255))
-        screen.blit(score_text, (20, 20))
+    def release(self, entity):
+        self.free.append(entity)
+        self.released += 1
+
+# Fences live from x=550 until they scroll past -SCREEN_WIDTH, at least 180 px
+# apart, so no more than 6 pairs are ever in play
+FENCE_POOL_SIZE = 16
+
+class PonySim:
+    """
+    Golden Pony game rules. reset(seed) starts a run and step(flap_pressed)
+    advances it by one tick with the flap input held or not. The same seed and
+    inputs always replay the same run.
+
+    Fences are kept in spawn order, which is also x order since they all scroll
+    at the same speed. Collision and scoring only look at the (top, bottom)
+    pairs at the front of two queues, so their cost does not grow with the
+    number of fences on screen. When masks are given, rect hits are confirmed
+    pixel by pixel; pony_masks holds one mask per animation frame.
+
+    Fences come from an EntityPool, so a run allocates no new entities once it
+    is going. The ground is a single strip; only how far it has scrolled is
+    tracked, in ground_scroll.
+    """
+    def __init__(self, pony_size, top_fence_size, bottom_fence_size,
+                 pony_masks=None, top_fence_mask=None, bottom_fence_mask=None):
+        self.pony_size = pony_size
+        self.top_fence_size = top_fence_size
+        self.bottom_fence_size = bottom_fence_size
+        self.pony_masks = pony_masks
+        self.fence_masks = {'top': top_fence_mask, 'bottom': bottom_fence_mask}
+        # Lowest opaque row of each pony frame, for the ground check
+        if pony_masks:
+            self.pony_bottoms = [max((r.bottom for r in mask.get_bounding_rects()), default=0)
+                                 for mask in pony_masks]
+        else:
+            self.pony_bottoms = None
+        self.rng = random.Random()
+        self.fence_pool = EntityPool(Fence, FENCE_POOL_SIZE)
+        self.fences = deque()
+        # Top fences of the pairs the pony can still hit, and of those it has not cleared yet
+        self.upcoming = deque()
+        self.unscored = deque()
+        self.reset()
+
+    def reset(self, seed=None):
+        self.rng.seed(seed)
+        self.pony = Pony(self.pony_size)
+        while self.fences:
+            self.fence_pool.release(self.fences.popleft())
+        self.upcoming.clear()
+        self.unscored.clear()
+        self.ground_scroll = 0
+        self.prev_ground_scroll = 0
+        self.fence_timer = 0
+        self.score = 0
+        self.steps = 0
+        self.game_over = False
+
+    def step(self, flap_pressed=False):
+        self.steps += 1
+
+        # Remember where everything was so frames can be drawn between ticks
+        self.pony.prev_y = self.pony.rect.y
+        for fence in self.fences:
+            fence.prev_x = fence.rect.x
+        self.prev_ground_scroll = self.ground_scroll
 
         # Update - Fences, Ground, and Pony
-        if pony.sprite.alive and not game_over:
-            fences.update()
-            ground.update()
-            pony.update()
-
-        # Fence Collisions 
-        collision_fences = pygame.sprite.spritecollide(pony.sprites()[0], fences, False)
-        collision_ground = pygame.sprite.spritecollide(pony.sprites()[0], ground, False)
-        
-        if (collision_fences or collision_ground) and not game_over:
-            pony.sprite.alive = False
-            game_over = True
-            
-            # Update high score if current score is higher
-            if score > high_score:
-                high_score = score
-                # Update the high score in the file - use a more reliable method
-                success = update_high_score_in_file(high_score)
-                if not success:
-                    print("Warning: Failed to save high score!")
-        
-        # Display game over screen
-        if game_over:
-            screen.blit(game_over_image, (SCREEN_WIDTH // 2 - game_over_image.get_width() // 2, 
-                                        SCREEN_HEIGHT // 2 - game_over_image.get_height() // 2))
-            
-            # Add total score text - positioned below the centered game over image
-            total_score_text = small_font.render('Total Score: ' + str(score), True, WHITE)
-            screen.blit(total_score_text, (SCREEN_WIDTH // 2 - total_score_text.get_width() // 2, 
-                                        SCREEN_HEIGHT // 2 + 30))
-            
-            # Add high score text - positioned further below
-            high_score_text = small_font.render('High Score: ' + str(high_score), True, BRIGHT_GOLD)
-            screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, 
-                                        SCREEN_HEIGHT // 2 + 50))
-            
-            # Add a small delay before accepting input to prevent accidental restarts
-            wait_time += 1
-            if wait_time > 30 and pygame.mouse.get_pressed()[0]:  # Half second delay (30 frames at 60fps)
-                score = 0
-                break
-            # Using buttons below
-            if wait_time > 30 and pygame.key.get_pressed()[pygame.K_SPACE]:  # Half second delay (30 frames at 60fps)
-                score = 0
+        if self.pony.alive and not self.game_over:
+            for fence in self.fences:
+                fence.update()
+            self.ground_scroll += scroll_speed
+            while self.fences and self.fences[0].rect.x <= -SCREEN_WIDTH:
+                self.fence_pool.release(self.fences.popleft())
+            self.pony.update(flap_pressed)
+
+            # Score the front pair once the pony is past its right edge
+            while self.unscored and pony_start_position[0] > self.unscored[0].partner.rect.right:
+                self.unscored.popleft().partner.passed = True
+                self.score += 1
+
+        # Fence and Ground Collisions
+        if not self.game_over:
+            if self.hits_fence() or self.hits_ground():
+                self.pony.alive = False
+                self.game_over = True
+
+        # Spawn Fences
+        if self.fence_timer <= 0 and self.pony.alive and not self.game_over:
+            x_top, x_bottom = 550, 550
+            y_top = self.rng.randint(-825, -600)
+            gap = self.rng.randint(100, 150)
+            y_bottom = y_top + self.top_fence_size[1] + gap
+            top = self.fence_pool.acquire(x_top, y_top, self.top_fence_size, 'top')
+            bottom = self.fence_pool.acquire(x_bottom, y_bottom, self.bottom_fence_size, 'bottom')
+            top.partner = bottom
+            self.fences.append(top)
+            self.fences.append(bottom)
+            self.upcoming.append(top)
+            self.unscored.append(top)
+            self.fence_timer = self.rng.randint(180, 250)
+        self.fence_timer -= 5
+        return not self.game_over
+
+    def hits_fence(self):
+        pony_rect = self.pony.rect
+        # Pairs entirely behind the pony can never be hit again
+        while self.upcoming and self.upcoming[0].rect.right <= pony_rect.left:
+            self.upcoming.popleft()
+        for top in self.upcoming:
+            if top.rect.left >= pony_rect.right:
                 break
+            if pony_rect.colliderect(top.rect) and self.masks_overlap(top):
+                return True
+            bottom = top.partner
+            if pony_rect.colliderect(bottom.rect) and self.masks_overlap(bottom):
+                return True
+        return False
 
-        # Spawn Fences 
-        if fence_timer <= 0 and pony.sprite.alive and not game_over:
-            x_top, x_bottom = 550, 550
-            y_top = random.randint(-825, -600)
-            gap = random.randint(100, 150)
-            y_bottom = y_top + top_fence_image.get_height() + gap
-            fences.add(Fence(x_top, y_top, top_fence_image, 'top'))
-            fences.add(Fence(x_bottom, y_bottom, bottom_fence_image, 'bottom'))
-            fence_timer = random.randint(180, 250)
-        fence_timer -= 5
+    def masks_overlap(self, fence):
+        fence_mask = self.fence_masks[fence.fence_type]
+        if self.pony_masks is None or fence_mask is None:
+            return True
+        pony_mask = self.pony_masks[self.pony.image_index // 10]
+        offset = (fence.rect.x - self.pony.rect.x, fence.rect.y - self.pony.rect.y)
+        return pony_mask.overlap(fence_mask, offset) is not None
+
+    def hits_ground(self):
+        # The ground strip spans the whole screen, so only the height matters
+        if self.pony_bottoms is None:
+            return self.pony.rect.bottom > ground_y
+        return self.pony.rect.y + self.pony_bottoms[self.pony.image_index // 10] > ground_y
+
+def new_pony_sim():
+    return PonySim(pony_images[0].get_size(), top_fence_image.get_size(),
+                   bottom_fence_image.get_size(),
+                   pony_masks=[assets.mask(path) for path in pony_image_paths],
+                   top_fence_mask=assets.mask("assets/fence_top.png"),
+                   bottom_fence_mask=assets.mask("assets/fence_bottom.png"))
 
-        clock.tick(30)
-        pygame.display.update()
+# ----------------------
+# Golden Pony Rendering
+# ----------------------
+class FixedTimestep:
+    """
+    Accumulates real time and hands out a whole number of fixed simulation
+    ticks per frame. When drawing falls behind, every tick still runs and the
+    frames that could not be drawn are counted in dropped_frames. Only stalls
+    longer than max_frame_time (a suspended process) are clamped.
+    """
+    def __init__(self, hz, max_frame_time=1.0):
+        self.step = 1.0 / hz
+        self.max_frame_time = max_frame_time
+        self.reset()
+
+    def reset(self):
+        self.previous = None
+        self.accumulator = 0.0
+        self.frames = 0
+        self.ticks = 0
+        self.dropped_frames = 0
+
+    def advance(self):
+        """
+        Returns how many simulation ticks are due since the last frame.
+        """
+        now = time.perf_counter()
+        if self.previous is not None:
+            self.accumulator += min(now - self.previous, self.max_frame_time)
+        self.previous = now
+        due = int(self.accumulator // self.step)
+        self.accumulator -= due * self.step
+        self.frames += 1
+        self.ticks += due
+        if due > 1:
+            self.dropped_frames += due - 1
+        return due
+
+    def alpha(self):
+        """
+        How far the current frame lies between the last tick and the next one (0..1).
+        """
+        return self.accumulator / self.step
+
+pony_timestep = FixedTimestep(SIM_HZ)
+
+class ScrollingLayer:
+    """
+    A horizontally wrapping layer. The image is tiled once into a surface at
+    least as wide as the screen, and each frame is drawn with at most two
+    area-clipped blits at the wrapped offset. speed scales the shared scroll
+    distance, so layers at different speeds give parallax.
+    """
+    def __init__(self, image, y, speed):
+        tiles = max(1, -(-SCREEN_WIDTH // image.get_width()))
+        self.surface = pygame.Surface((image.get_width() * tiles, image.get_height()),
+                                      image.get_flags() & pygame.SRCALPHA, image)
+        for i in range(tiles):
+            self.surface.blit(image, (i * image.get_width(), 0))
+        self.width = self.surface.get_width()
+        self.height = self.surface.get_height()
+        self.y = y
+        self.speed = speed
+
+    def draw(self, surface, scroll, y=None):
+        y = self.y if y is None else y
+        offset = int(scroll * self.speed) % self.width
+        visible = min(self.width - offset, SCREEN_WIDTH)
+        surface.blit(self.surface, (0, y), (offset, 0, visible, self.height))
+        if visible < SCREEN_WIDTH:
+            surface.blit(self.surface, (visible, y), (0, 0, SCREEN_WIDTH - visible, self.height))
+
+    def rect(self):
+        return pygame.Rect(0, self.y, SCREEN_WIDTH, self.height)
+
+def lerp(a, b, t):
+    return round(a + (b - a) * t)
+
+class LayerSprite(pygame.sprite.DirtySprite):
+    """
+    The on-screen part of a ScrollingLayer as a dirty sprite, redrawn only when
+    the scroll offset changes.
+    """
+    def __init__(self, scrolling_layer):
+        pygame.sprite.DirtySprite.__init__(self)
+        self.scrolling_layer = scrolling_layer
+        height = max(0, min(scrolling_layer.height, SCREEN_HEIGHT - scrolling_layer.y))
+        self.image = pygame.Surface((SCREEN_WIDTH, height), 0, scrolling_layer.surface)
+        self.rect = self.image.get_rect(topleft=(0, scrolling_layer.y))
+        self.scroll = None
+
+    def set_scroll(self, scroll):
+        if scroll != self.scroll:
+            self.scrolling_layer.draw(self.image, scroll, 0)
+            self.scroll = scroll
+            self.dirty = 1
+
+class PonyRenderer:
+    """
+    Draws a PonySim through a LayeredDirty group over the skyline. Each frame
+    only the background under sprites that moved or changed is restored, and
+    draw() returns just those rects for the display to push. last_repainted
+    and total_repainted count the pixels repainted.
+    """
+    FENCE_LAYER, GROUND_LAYER, PONY_LAYER, SCORE_LAYER, OVERLAY_LAYER = range(1, 6)
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.screen_rect = surface.get_rect()
+        self.background = pygame.Surface(self.screen_rect.size, 0, surface)
+        # A moving skyline changes every pixel, so it needs a full repaint each frame
+        self.static_background = all(layer.speed == 0 for layer in pony_background_layers)
+        self.group = pygame.sprite.LayeredDirty()
+        self.group.set_clip(self.screen_rect)
+        self.group.set_timing_threshold(float("inf"))  # never fall back to full-screen updates
+        self.fence_sprites = {}
+
+        self.ground_sprites = [LayerSprite(layer) for layer in pony_foreground_layers]
+        self.group.add(*self.ground_sprites, layer=self.GROUND_LAYER)
+        self.pony_sprite = self.add_sprite(self.PONY_LAYER)
+        self.score_sprite = self.add_sprite(self.SCORE_LAYER)
+        self.overlay_sprite = self.add_sprite(self.OVERLAY_LAYER)
+        self.overlay_sprite.visible = 0
+        self.score = None
+        self.first_frame = True
+        self.frames = 0
+        self.last_repainted = 0
+        self.total_repainted = 0
+
+    def add_sprite(self, layer, image=None):
+        sprite = pygame.sprite.DirtySprite()
+        sprite.image = image if image is not None else pygame.Surface((0, 0))
+        sprite.rect = sprite.image.get_rect()
+        self.group.add(sprite, layer=layer)
+        return sprite
+
+    def place(self, sprite, image, x, y):
+        # The sprite's rect is updated in place; a new one is only sized for a new image
+        if sprite.image is not image:
+            sprite.image = image
+            sprite.rect.size = image.get_size()
+            sprite.dirty = 1
+        if sprite.rect.topleft != (x, y):
+            sprite.rect.topleft = (x, y)
+            sprite.dirty = 1
+
+    def draw(self, sim, alpha=1.0):
+        scroll = lerp(sim.prev_ground_scroll, sim.ground_scroll, alpha)
+        if self.first_frame or not self.static_background:
+            for layer in pony_background_layers:
+                layer.draw(self.background, scroll)
+            self.group.clear(self.surface, self.background)
+            self.group.repaint_rect(self.screen_rect)
+
+        # Fences: one sprite per pooled fence, hidden while the fence is out of play.
+        # Each sprite is stamped with the frame it was last placed in.
+        frame = self.frames
+        for fence in sim.fences:
+            sprite = self.fence_sprites.get(fence)
+            if sprite is None:
+                sprite = self.fence_sprites[fence] = self.add_sprite(self.FENCE_LAYER)
+            image = top_fence_image if fence.fence_type == 'top' else bottom_fence_image
+            self.place(sprite, image, lerp(fence.prev_x, fence.rect.x, alpha), fence.rect.y)
+            sprite.placed_frame = frame
+            # Setting visible marks the sprite dirty, so only do it on a change
+            if not sprite.visible:
+                sprite.visible = 1
+        for sprite in self.fence_sprites.values():
+            if sprite.visible and sprite.placed_frame != frame:
+                sprite.visible = 0
+
+        for sprite in self.ground_sprites:
+            sprite.set_scroll(scroll)
+        pony = sim.pony
+        self.place(self.pony_sprite, pony_images[pony.image_index // 10],
+                   pony.rect.x, lerp(pony.prev_y, pony.rect.y, alpha))
 
-def pony_menu():
-    global game_stopped
-    waiting = True
+        # Show Score
+        if sim.score != self.score:
+            self.score = sim.score
+            score_text = text_cache.render(score_font, 'Score: ' + str(sim.score), True, WHITE)
+            self.place(self.score_sprite, score_text, 20, 20)
+
+        # Game over screen, composed once when the run ends
+        if sim.game_over and not self.overlay_sprite.visible:
+            overlay = pygame.Surface(self.screen_rect.size, pygame.SRCALPHA)
+            draw_game_over(overlay, sim.score)
+            self.place(self.overlay_sprite, overlay, 0, 0)
+            self.overlay_sprite.visible = 1
+
+        rects = self.group.draw(self.surface)
+        self.first_frame = False
+        self.frames += 1
+        self.last_repainted = sum(rect.width * rect.height for rect in rects)
+        self.total_repainted += self.last_repainted
+        return rects
+
+def draw_game_over(surface, score):
+    surface.blit(game_over_image, (SCREEN_WIDTH // 2 - game_over_image.get_width() // 2,
+                                   SCREEN_HEIGHT // 2 - game_over_image.get_height() // 2))
+
+    # Add total score text - positioned below the centered game over image
+    total_score_text = text_cache.render(small_font, 'Total Score: ' + str(score), True, WHITE)
+    surface.blit(total_score_text, (SCREEN_WIDTH // 2 - total_score_text.get_width() // 2,
+                                    SCREEN_HEIGHT // 2 + 30))
+
+    # Add high score text - positioned further below
+    high_score_text = text_cache.render(small_font, 'High Score: ' + str(high_score), True, BRIGHT_GOLD)
+    surface.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2,
+                                   SCREEN_HEIGHT // 2 + 50))
+
+class PonyGameScene(Scene):
+    """
+    A run of Golden Pony. A tap after the game-over delay goes back to the
+    pony menu.
+    """
+    fps = RENDER_FPS
+    events = ()  # flaps are read from the input snapshot
+
+    def enter(self):
+        Scene.enter(self)
+        pony_assets.load()
+        self.sim = new_pony_sim()
+        self.renderer = PonyRenderer(screen)
+        pony_timestep.reset()
+        self.wait_ticks = 0  # Add a small delay before accepting input after game over
+        self.flap_latched = False
+
+    def update(self, dt):
+        global high_score
+        sim = self.sim
+
+        # User Input - a tap between two ticks is held for the next one
+        flap_pressed = touch_input.pressed[0] or pygame.key.get_pressed()[pygame.K_SPACE]
+        self.flap_latched = self.flap_latched or flap_pressed
+
+        for _ in range(pony_timestep.advance()):
+            was_over = sim.game_over
+            sim.step(self.flap_latched)
+            self.flap_latched = flap_pressed
 
+            # Update high score if current score is higher
+            if sim.game_over and not was_over and sim.score > high_score:
+                high_score = sim.score
+                # Saved by the state store's writer thread, off this frame
+                state_store.set("golden_pony.high_score", high_score)
+            if sim.game_over:
+                self.wait_ticks += 1
+
+        # Add a small delay before accepting input to prevent accidental restarts
+        if sim.game_over and self.wait_ticks > GAME_OVER_INPUT_DELAY_TICKS and flap_pressed:
+            scene_manager.pop()
+
+    def render(self, surface):
+        for rect in self.renderer.draw(self.sim, pony_timestep.alpha()):
+            display.invalidate(rect)
+
+class PonyMenuScene(Scene):
+    """
+    Golden Pony's start screen: a tap starts a run, BACK returns to the menu.
+    """
+    events = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
     # 1. Define a Back button rect & font (top-left or top-center)
     back_button_rect = pygame.Rect((480 - 60) // 2, 0, 60, 30)
-    back_font = pygame.font.SysFont("assets/PressStart2P-Regular.ttf", 14)
-
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # Check if user clicked the BACK button
-                if back_button_rect.collidepoint(event.pos):
-                    # 2. Behavior: For now, exit entire game
-                    return "back_to_app"
-                else:
-                    # 3. Otherwise, start the game
-                    waiting = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                   waiting = False  # also start game with space
-                elif event.key == pygame.K_LEFT:
-                    return "back_to_app"
-
-        screen.fill(BLACK)
-        screen.blit(skyline_image, (0, 0))
-        screen.blit(ground_image, Ground(0, 520))
-        screen.blit(pony_images[0], (100, 250))
-        screen.blit(start_image, (
+
+    def enter(self):
+        Scene.enter(self)
+        pony_assets.load()
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            # Check if user clicked the BACK button
+            if self.back_button_rect.collidepoint(event.pos):
+                scene_manager.pop()
+            else:
+                # 3. Otherwise, start the game
+                scene_manager.push(PonyGameScene())
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                scene_manager.push(PonyGameScene())  # also start game with space
+            elif event.key == pygame.K_LEFT:
+                scene_manager.pop()
+
+    def render(self, surface):
+        # The menu is static, so it only needs to be painted once per visit
+        if self.last_state is not None:
+            return
+        surface.fill(BLACK)
+        surface.blit(skyline_image, (0, 0))
+        surface.blit(ground_image, (0, 520))
+        surface.blit(pony_images[0], (100, 250))
+        surface.blit(start_image, (
             SCREEN_WIDTH // 10 - start_image.get_width() // 10,
             SCREEN_WIDTH // 10 - start_image.get_height() // 10
         ))
 
         # Show high score on menu screen - also using the brighter gold
-        high_score_text = score_font.render('High Score: ' + str(high_score), True, BRIGHT_GOLD)
-        screen.blit(high_score_text, (20, 20))
+        high_score_text = text_cache.render(score_font, 'High Score: ' + str(high_score), True, BRIGHT_GOLD)
+        surface.blit(high_score_text, (20, 20))
 
         # 4. Draw the Back button
-        pygame.draw.rect(screen, (80, 80, 80), back_button_rect)
-        back_text = back_font.render("BACK", True, WHITE)
-        back_text_rect = back_text.get_rect(center=back_button_rect.center)
-        screen.blit(back_text, back_text_rect)
+        pygame.draw.rect(surface, (80, 80, 80), self.back_button_rect)
+        back_text = text_cache.render(back_font, "BACK", True, WHITE)
+        back_text_rect = back_text.get_rect(center=self.back_button_rect.center)
+        surface.blit(back_text, back_text_rect)
+        display.invalidate_all()
+        self.last_state = high_score
+
+    def next_change(self):
+        return float("inf")
+
 
-        pygame.display.update()
+# ----------------------
+# Touch Calibration App
+# ----------------------
+# Screen points tapped during calibration: the corners, inset 10%, then the centre
+CALIBRATION_TARGETS = [
+    (SCREEN_WIDTH // 10, SCREEN_HEIGHT // 10),
+    (SCREEN_WIDTH - SCREEN_WIDTH // 10, SCREEN_HEIGHT // 10),
+    (SCREEN_WIDTH - SCREEN_WIDTH // 10, SCREEN_HEIGHT - SCREEN_HEIGHT // 10),
+    (SCREEN_WIDTH // 10, SCREEN_HEIGHT - SCREEN_HEIGHT // 10),
+    (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2),
+]
+
+class CalibrationScene(Scene):
+    """
+    Asks for a tap on each calibration target, fits the touch calibration to
+    the raw tap positions and saves it in the state store.
+    """
+    events = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
+    def __init__(self):
+        self.raw_points = []
+
+    def enter(self):
+        Scene.enter(self)
+        menu_assets.load()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            scene_manager.pop()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.raw_points.append(event.raw_pos)
+            if len(self.raw_points) == len(CALIBRATION_TARGETS):
+                self.finish()
+
+    def finish(self):
+        try:
+            matrix = fit_affine(self.raw_points, CALIBRATION_TARGETS)
+        except ValueError:
+            self.raw_points = []  # degenerate taps, go round again
+            return
+        touch_input.set_calibration(matrix)
+        state_store.set(CALIBRATION_KEY, [list(row) for row in matrix])
+        errors = [(touch_input.calibrate(raw)[0] - x) ** 2 + (touch_input.calibrate(raw)[1] - y) ** 2
+                  for raw, (x, y) in zip(self.raw_points, CALIBRATION_TARGETS)]
+        print(f"Touch calibration saved (rms error {math.sqrt(sum(errors) / len(errors)):.1f} px)")
+        scene_manager.pop()
+
+    def render(self, surface):
+        index = len(self.raw_points)
+        if index == self.last_state or index >= len(CALIBRATION_TARGETS):
+            return
+        surface.fill(BASE)
+        inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
+        draw_rounded_rect(surface, inner_rect, LIGHT_GRAY, 15)
+        text = text_cache.render(app_font, f"Tap the target ({index + 1}/{len(CALIBRATION_TARGETS)})", True, RED)
+        surface.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)))
+        x, y = CALIBRATION_TARGETS[index]
+        pygame.draw.circle(surface, RED, (x, y), 12, 2)
+        pygame.draw.line(surface, RED, (x - 18, y), (x + 18, y), 2)
+        pygame.draw.line(surface, RED, (x, y - 18), (x, y + 18), 2)
+        display.invalidate_all()
+        self.last_state = index
 
-    # Go into the main game loop
-    golden_pony()
+    def next_change(self):
+        return float("inf")
 
 
 # ----------------------
 # Main Loop for Smartwatch
 # ----------------------
+# Assets each menu entry prefetches while it is highlighted
+app_assets = {
+    "timer": timer_assets,
+    "numbergenerator": numgen_assets,
+    "raffle": numgen_assets,
+    "picker": picker_assets,
+    "goldenpony": pony_assets,
+    "calibrate": menu_assets,
+}
+
+# Scene each menu entry opens
+app_scenes = {
+    "timer": TimerScene,
+    "numbergenerator": SliderScene,
+    "raffle": RaffleScene,
+    "picker": PickerScene,
+    "goldenpony": PonyMenuScene,
+    "calibrate": CalibrationScene,
+}
+
+def draw_home_screen(surface, time_str, date_str, hover):
+    """
+    Draws the home clock face and returns the rect covering the time and date text.
+    """
+    surface.fill(BASE)
+    outer_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    draw_rounded_rect_outline(surface, outer_rect, BASE, 15, 4)
+    inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
+    draw_rounded_rect(surface, inner_rect, LIGHT_GRAY, 15)
+    time_surface = text_cache.render(font_time, time_str, True, GOLD)
+    time_rect = time_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
+    surface.blit(time_surface, time_rect)
+    date_surface = text_cache.render(font_date, date_str, True, GOLD)
+    date_rect = date_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10))
+    surface.blit(date_surface, date_rect)
+    if hover:
+        button_color = GOLD
+        text_color = RED
+    else:
+        button_color = RED
+        text_color = GOLD
+    draw_rounded_rect(surface, button_rect, button_color, 10)
+    button_text_surface = text_cache.render(font_button, "ENTER", True, text_color)
+    button_text_rect = button_text_surface.get_rect(center=button_rect.center)
+    surface.blit(button_text_surface, button_text_rect)
+    return time_rect.union(date_rect)
+
+class HomeScene(Scene):
+    """
+    The clock face. ENTER (or space) opens the app menu.
+    """
+    events = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.KEYDOWN)
+    def __init__(self):
+        self.last_text_rect = None
+        self.home_state = None
+
+    def enter(self):
+        Scene.enter(self)
+        home_assets.load()
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if button_rect.collidepoint(event.pos):
+                scene_manager.push(AppMenuScene())
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                scene_manager.push(AppMenuScene())
+
+    def update(self, dt):
+        now = datetime.datetime.now()
+        time_str = now.strftime("%I:%M")
+        date_str = now.strftime("%A, %B %d").lstrip("0").replace(" 0", " ")
+        hover = button_rect.collidepoint(touch_input.pos)
+        self.home_state = (time_str, date_str, hover)
+
+    def render(self, surface):
+        # The clock face only changes once a minute or when the button hover flips
+        home_state, last_home_state = self.home_state, self.last_state
+        if home_state == last_home_state:
+            return
+        time_str, date_str, hover = home_state
+        text_rect = draw_home_screen(surface, time_str, date_str, hover)
+        if last_home_state is None:
+            display.invalidate_all()
+        else:
+            if home_state[:2] != last_home_state[:2]:
+                display.invalidate(text_rect.union(self.last_text_rect))
+            if hover != last_home_state[2]:
+                display.invalidate(button_rect)
+        self.last_state, self.last_text_rect = home_state, text_rect
+
+    def next_change(self):
+        # Only the minute (and, at midnight, the date) changes without input
+        now = datetime.datetime.now()
+        return 60 - now.second - now.microsecond / 1e6
+
 def main():
-    global current_screen, transition_in_progress, scroll_offset
-    clock = pygame.time.Clock()
-    running = True
-    while running:
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            if not transition_in_progress:
-                transformed_pos = transform_coords((mouse_x, mouse_y))
-                if current_screen == HOME_SCREEN:
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if button_rect.collidepoint(transformed_pos):
-                            transition_in_progress = True
-                            current_screen = APP_SCREEN
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_SPACE:
-                            transition_in_progress = True
-                            current_screen = APP_SCREEN
-        screen.fill(BASE)
-        if current_screen == HOME_SCREEN:
-            outer_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
-            draw_rounded_rect_outline(screen, outer_rect, BASE, 15, 4)
-            inner_rect = pygame.Rect(10, 10, SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
-            draw_rounded_rect(screen, inner_rect, LIGHT_GRAY, 15)
-            now = datetime.datetime.now()
-            time_str = now.strftime("%I:%M")
-            date_str = now.strftime("%A, %B %d").lstrip("0").replace(" 0", " ")
-            time_surface = font_time.render(time_str, True, GOLD)
-            time_rect = time_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
-            screen.blit(time_surface, time_rect)
-            date_surface = font_date.render(date_str, True, GOLD)
-            date_rect = date_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10))
-            screen.blit(date_surface, date_rect)
-            if button_rect.collidepoint(mouse_x, mouse_y):
-                button_color = GOLD
-                text_color = RED
-            else:
-                button_color = RED
-                text_color = GOLD
-            draw_rounded_rect(screen, button_rect, button_color, 10)
-            button_text_surface = font_button.render("ENTER", True, text_color)
-            button_text_rect = button_text_surface.get_rect(center=button_rect.center)
-            screen.blit(button_text_surface, button_text_rect)
-        elif current_screen == APP_SCREEN:
-            selected_app = run_app_menu(screen)
-            transition_in_progress = True
-            if selected_app == "timer":
-                current_screen = TIMER_SCREEN
-            elif selected_app == "numbergenerator":
-                current_screen = NUMGEN_SCREEN
-                transition_in_progress = True
-            elif selected_app == "goldenpony":
-                current_screen = COMPLEX_APP_SCREEN
-        elif current_screen == TIMER_SCREEN:
-            back_to_app = run_timer_app()
-            if back_to_app == "back_to_app":
-                current_screen = APP_SCREEN
-                transition_in_progress = True
-        elif current_screen == NUMGEN_SCREEN:
-            back_to_app = run_num_gen_screen(screen)
-            if back_to_app == "back_to_slider":
-                current_screen = APP_SCREEN
-                transition_in_progress = True
-        elif current_screen == COMPLEX_APP_SCREEN:
-            back_to_app = run_complex_app_screen(screen)
-            if back_to_app:
-                current_screen = APP_SCREEN
-                transition_in_progress = True
-        pygame.display.flip()
-        clock.tick(30)
+    init_display()
+    open_state_store()
+    home_assets.load()
+    # XI_PROFILE=1 starts with the profiler on; `kill -USR1 <pid>` dumps it without a keyboard
+    if os.environ.get("XI_PROFILE"):
+        profiler.toggle()
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: profiler.dump())
+    scene_manager.run(HomeScene())
     pygame.quit()
     sys.exit()
 